@@ -0,0 +1,106 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reviews.models import User
+
+USER_CLAIMS = ('username', 'role', 'is_staff')
+
+
+def access_token_for_user(user):
+    """Access-токен с ролью пользователя для проверки прав без БД."""
+    token = AccessToken.for_user(user)
+    for claim in USER_CLAIMS:
+        token[claim] = getattr(user, claim)
+    return token
+
+
+def user_state_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+def user_state(user, deleted=False):
+    return {
+        'username': user.username,
+        'role': user.role,
+        'is_staff': user.is_staff,
+        'is_active': user.is_active and not deleted,
+    }
+
+
+def remember_user_state(user, deleted=False):
+    """Сохраняет в кеше актуальную роль и активность пользователя.
+
+    Запись перекрывает устаревшие утверждения о роли в выданных ранее
+    токенах и живёт ``settings.AUTH_USER_STATE_TIMEOUT`` секунд.
+    """
+    cache.set(
+        user_state_key(user.pk),
+        user_state(user, deleted),
+        settings.AUTH_USER_STATE_TIMEOUT
+    )
+
+
+def get_user_state(user_id):
+    """Роль и активность пользователя из кеша, а при промахе - из базы.
+
+    Для удалённого пользователя возвращается неактивное состояние.
+    """
+    state = cache.get(user_state_key(user_id))
+    if state is not None:
+        return state
+    user = User.objects.filter(pk=user_id).only(
+        'username', 'role', 'is_staff', 'is_active'
+    ).first()
+    if user is None:
+        state = {'is_active': False}
+        cache.set(
+            user_state_key(user_id), state, settings.AUTH_USER_STATE_TIMEOUT
+        )
+        return state
+    remember_user_state(user)
+    return user_state(user)
+
+
+class ClaimsUser(TokenUser):
+    """Пользователь, восстановленный из утверждений access-токена."""
+
+    @cached_property
+    def role(self):
+        return self.token.get('role', User.USER)
+
+    @property
+    def is_admin(self):
+        return self.role == User.ADMIN or self.is_staff
+
+    @property
+    def is_moderator(self):
+        return self.role == User.MODERATOR
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """JWT-аутентификация без запроса к таблице пользователей.
+
+    Роль и активность берутся не из токена, а из кеша состояний
+    пользователей; при промахе кеша они читаются из базы данных.
+    Токены без утверждений о роли (выданные до их появления)
+    проверяются по базе данных, как в ``JWTAuthentication``.
+    """
+
+    def get_user(self, validated_token):
+        if any(claim not in validated_token for claim in USER_CLAIMS):
+            return super().get_user(validated_token)
+        state = get_user_state(validated_token[api_settings.USER_ID_CLAIM])
+        if not state['is_active']:
+            raise AuthenticationFailed(
+                _('User is inactive'), code='user_inactive'
+            )
+        for claim in USER_CLAIMS:
+            validated_token[claim] = state[claim]
+        return ClaimsUser(validated_token)
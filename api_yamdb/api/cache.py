@@ -0,0 +1,116 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.http import HttpResponse
+
+from api.replicas import replica_may_lag
+from reviews.generations import get_generations
+
+_sizes = {}
+
+
+class MemoryBoundedLocMemCache(LocMemCache):
+    """LocMemCache, ограниченный суммарным размером значений.
+
+    Кроме ``MAX_ENTRIES`` принимает ``OPTIONS['MAX_BYTES']``: при
+    превышении удаляются давно не читавшиеся записи (LRU).
+    """
+
+    def __init__(self, name, params):
+        super().__init__(name, params)
+        self._max_bytes = params.get('OPTIONS', {}).get('MAX_BYTES')
+        self._sizes = _sizes.setdefault(name, {'total': 0, 'keys': {}})
+
+    def _forget_size(self, key):
+        size = self._sizes['keys'].pop(key, 0)
+        self._sizes['total'] -= size
+
+    def _set(self, key, value, timeout=None):
+        self._forget_size(key)
+        super()._set(key, value, timeout)
+        self._sizes['keys'][key] = len(value)
+        self._sizes['total'] += len(value)
+        if self._max_bytes is None:
+            return
+        while self._sizes['total'] > self._max_bytes and self._cache:
+            oldest, _ = self._cache.popitem()
+            self._expire_info.pop(oldest, None)
+            self._forget_size(oldest)
+
+    def _cull(self):
+        super()._cull()
+        for key in set(self._sizes['keys']) - set(self._cache):
+            self._forget_size(key)
+
+    def _delete(self, key):
+        super()._delete(key)
+        self._forget_size(key)
+
+    def clear(self):
+        super().clear()
+        with self._lock:
+            self._sizes['keys'].clear()
+            self._sizes['total'] = 0
+
+
+def response_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def representation_hash(request, version):
+    """Хеш адреса, нормализованной строки запроса, формата и версии данных.
+
+    Схема и хост входят в хеш: в ответах есть абсолютные ссылки
+    пагинации, построенные по заголовку Host запроса.
+    """
+    query = sorted(
+        (name, sorted(values))
+        for name, values in request.query_params.lists()
+    )
+    source = repr((
+        request.build_absolute_uri(request.path),
+        query,
+        request.accepted_renderer.format,
+        version,
+    ))
+    return hashlib.sha1(source.encode()).hexdigest()
+
+
+def response_cache_key(request, resources):
+    return 'response:' + representation_hash(
+        request, get_generations(*resources)
+    )
+
+
+def make_etag(request, version):
+    return f'"{representation_hash(request, version)}"'
+
+
+class NotModified(Exception):
+    """Прерывает обработку запроса готовым ответом 304."""
+
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+def cached_response(request, resources, get_response):
+    """Отдаёт закешированный ответ анонимному GET или кеширует новый."""
+    if request.method != 'GET' or request.user.is_authenticated:
+        return get_response()
+    cache = response_cache()
+    key = response_cache_key(request, resources)
+    cached = cache.get(key)
+    if cached is not None:
+        content, content_type = cached
+        return HttpResponse(content, content_type=content_type)
+    response = get_response()
+    if response.status_code == 200 and not replica_may_lag():
+        response.add_post_render_callback(
+            lambda rendered: cache.set(
+                key, (rendered.content, rendered['Content-Type'])
+            )
+        )
+    return response
@@ -0,0 +1,32 @@
+"""Проверки настроек, от которых зависит согласованность кешей."""
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Tags, Warning, register
+from django.utils.module_loading import import_string
+
+
+@register(Tags.caches)
+def check_shared_default_cache(app_configs, **kwargs):
+    """Кеш ``default`` должен быть общим для всех процессов.
+
+    В нём лежат поколения ресурсов, версии справочников и состояние
+    пользователей. Если у каждого процесса своя копия, запись меняет
+    поколение только в том процессе, который её выполнил, а остальные
+    отдают устаревшие ответы и отвечают 304 на устаревшие ETag.
+    """
+    if settings.DEBUG:
+        return []
+    backend = import_string(settings.CACHES[DEFAULT_CACHE_ALIAS]['BACKEND'])
+    if not issubclass(backend, LocMemCache):
+        return []
+    return [Warning(
+        'Кеш default хранится в памяти процесса: при нескольких процессах '
+        'кеш ответов и ETag отстают от записей в других процессах.',
+        hint=(
+            'Задайте общий кеш переменными окружения YAMDB_CACHE_BACKEND '
+            'и YAMDB_CACHE_LOCATION или, если процесс один, отключите '
+            'проверку в SILENCED_SYSTEM_CHECKS.'
+        ),
+        id='api.W001',
+    )]
@@ -0,0 +1,72 @@
+"""Сжатие ответов и статических файлов в gzip и brotli."""
+import re
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP = 'gzip'
+BROTLI = 'br'
+# Предпочтительные кодировки в порядке убывания степени сжатия.
+ENCODINGS = (BROTLI, GZIP) if brotli is not None else (GZIP,)
+EXTENSIONS = {GZIP: '.gz', BROTLI: '.br'}
+
+ACCEPT_ENCODING = re.compile(
+    r'\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?\s*(?:,|$)'
+)
+
+
+def accepted_encodings(header):
+    """Кодировки из Accept-Encoding, которые клиент принимает (q > 0)."""
+    accepted = {}
+    for name, quality in ACCEPT_ENCODING.findall(header.lower()):
+        try:
+            accepted[name] = float(quality) if quality else 1.0
+        except ValueError:
+            continue
+    return {
+        name for name in ENCODINGS
+        if accepted.get(name, accepted.get('*', 0)) > 0
+    }
+
+
+def choose_encoding(header):
+    accepted = accepted_encodings(header)
+    return next((name for name in ENCODINGS if name in accepted), None)
+
+
+def gzip_compressor(level):
+    return zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+
+def compress(data, encoding, level):
+    """Сжимает байты целиком; ``level`` - уровень gzip или качество brotli."""
+    if encoding == BROTLI:
+        return brotli.compress(data, quality=level)
+    compressor = gzip_compressor(level)
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_sequence(chunks, encoding, level):
+    """Сжимает поток по частям, не собирая его целиком в памяти.
+
+    После каждой части буфер компрессора сбрасывается, чтобы клиент
+    получал данные по мере их появления, а не крупными порциями.
+    """
+    if encoding == BROTLI:
+        compressor = brotli.Compressor(quality=level)
+        process, finish = compressor.process, compressor.finish
+        flush = compressor.flush
+    else:
+        compressor = gzip_compressor(level)
+        process, finish = compressor.compress, compressor.flush
+
+        def flush():
+            return compressor.flush(zlib.Z_SYNC_FLUSH)
+    for chunk in chunks:
+        data = process(chunk) + flush()
+        if data:
+            yield data
+    yield finish()
@@ -0,0 +1,98 @@
+from django.db.models import Count
+from django_filters import rest_framework as rest_filters
+from rest_framework import filters
+
+from reviews.lookups import categories, genres
+from reviews.models import GenreTitle, Title
+from reviews.search import full_text_search
+
+ANY = 'any'
+ALL = 'all'
+GENRE_MATCH_CHOICES = (
+    (ANY, 'Любой из жанров'),
+    (ALL, 'Все жанры'),
+)
+
+
+class SlugInFilter(rest_filters.BaseInFilter, rest_filters.CharFilter):
+    pass
+
+
+def lookup_ids(table, slugs):
+    """Ключи объектов справочника по слагам без запроса к БД."""
+    objects = (table.get_by_slug(slug) for slug in slugs)
+    return [obj.pk for obj in objects if obj is not None]
+
+
+class TitleFilter(rest_filters.FilterSet):
+    """Фильтр произведений.
+
+    ``genre=a,b`` отбирает произведения с любым из жанров или, при
+    ``genre_match=all``, со всеми сразу. Жанры проверяются подзапросом
+    ``pk IN (...)`` по ``GenreTitle``, поэтому строки не дублируются
+    и число соединений не растёт с числом жанров.
+    """
+    genre = SlugInFilter(method='filter_genre')
+    genre_match = rest_filters.ChoiceFilter(
+        choices=GENRE_MATCH_CHOICES, method='filter_genre_match'
+    )
+    category = rest_filters.CharFilter(method='filter_category')
+    category__in = SlugInFilter(method='filter_category')
+    name = rest_filters.CharFilter(field_name='name', lookup_expr='icontains')
+
+    class Meta:
+        model = Title
+        fields = {
+            'year': ('exact', 'gte', 'lte'),
+            'rating': ('gte', 'lte'),
+        }
+
+    def filter_genre(self, queryset, name, value):
+        ids = lookup_ids(genres, set(value))
+        links = GenreTitle.objects.filter(genre_id__in=ids)
+        if self.form.cleaned_data.get('genre_match') == ALL:
+            if len(ids) < len(set(value)):
+                return queryset.none()
+            links = links.values('title_id').annotate(
+                genre_count=Count('genre_id', distinct=True)
+            ).filter(genre_count=len(ids))
+        return queryset.filter(pk__in=links.values('title_id'))
+
+    def filter_genre_match(self, queryset, name, value):
+        return queryset
+
+    def filter_category(self, queryset, name, value):
+        slugs = value if isinstance(value, list) else [value]
+        return queryset.filter(category_id__in=lookup_ids(categories, slugs))
+
+
+class StableOrderingFilter(filters.OrderingFilter):
+    """Сортировка с первичным ключом в конце для однозначного порядка.
+
+    Направление ключа совпадает с направлением последнего поля, чтобы
+    индекс ``(..., поле)`` читался целиком в одну сторону без сортировки.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        ordering = [
+            field for field in ordering
+            if field.lstrip('-') not in ('id', 'pk')
+        ]
+        descending = bool(ordering) and ordering[-1].startswith('-')
+        return (*ordering, '-pk' if descending else 'pk')
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """Поиск ``?search=`` по полнотекстовому индексу поля ``text``.
+
+    Результаты упорядочены по релевантности.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        return full_text_search(queryset, query)
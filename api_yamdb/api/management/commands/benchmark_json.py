@@ -0,0 +1,75 @@
+import timeit
+
+from django.core.management import BaseCommand, CommandError
+from django.db.models import Count
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from api.renderers import FastJSONRenderer, orjson
+from api.views import ReviewViewSet, TitleViewSet
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает скорость JSONRenderer и FastJSONRenderer '
+        'на страницах /titles/ и /reviews/ из базы данных'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=100,
+            help='Размер страницы'
+        )
+        parser.add_argument(
+            '--number',
+            type=int,
+            default=200,
+            help='Сколько раз отрисовать страницу в одном замере'
+        )
+
+    def get_payloads(self, limit):
+        factory = APIRequestFactory()
+        params = {'limit': limit}
+        payloads = {
+            '/api/v1/titles/': TitleViewSet.as_view({'get': 'list'})(
+                factory.get('/api/v1/titles/', params)
+            ).data,
+        }
+        title = Title.objects.annotate(
+            reviews_total=Count('reviews')
+        ).order_by('-reviews_total').first()
+        if title is not None:
+            path = f'/api/v1/titles/{title.pk}/reviews/'
+            payloads[path] = ReviewViewSet.as_view({'get': 'list'})(
+                factory.get(path, params), title_id=title.pk
+            ).data
+        return payloads
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(self.style.WARNING(
+                'orjson не установлен, FastJSONRenderer работает '
+                'через стандартный json'
+            ))
+        renderers = (JSONRenderer(), FastJSONRenderer())
+        number = options['number']
+        for path, data in self.get_payloads(options['limit']).items():
+            outputs = [renderer.render(data) for renderer in renderers]
+            if outputs[0] != outputs[1]:
+                raise CommandError(f'{path}: вывод рендереров различается')
+            timings = [
+                min(timeit.repeat(
+                    lambda: renderer.render(data), number=number, repeat=5
+                )) / number
+                for renderer in renderers
+            ]
+            self.stdout.write(
+                f'{path}: {len(data["results"])} строк, '
+                f'{len(outputs[0])} байт; JSONRenderer '
+                f'{timings[0] * 1e6:.1f} мкс, FastJSONRenderer '
+                f'{timings[1] * 1e6:.1f} мкс, '
+                f'ускорение {timings[0] / timings[1]:.1f}x'
+            )
@@ -0,0 +1,36 @@
+import time
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+
+from api.replicas import replicate
+
+
+class Command(BaseCommand):
+    help = (
+        'Копирует основную базу SQLite в реплики из DATABASE_REPLICAS; '
+        'заменяет репликацию при локальном запуске'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0,
+            help='Повторять копирование каждые N секунд (0 - один раз)'
+        )
+
+    def handle(self, *args, **options):
+        if not settings.DATABASE_REPLICAS:
+            raise CommandError(
+                'Реплики не заданы: укажите их в YAMDB_DB_REPLICAS'
+            )
+        while True:
+            for alias in settings.DATABASE_REPLICAS:
+                replicate(alias)
+            self.stdout.write(
+                f'Реплики обновлены: {", ".join(settings.DATABASE_REPLICAS)}'
+            )
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,170 @@
+import logging
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.dispatch import Signal
+from django.utils.cache import patch_vary_headers
+from rest_framework.permissions import SAFE_METHODS
+
+from api.compression import choose_encoding, compress, compress_sequence
+from api.replicas import choose_replica, pin_to_primary, read_alias
+
+logger = logging.getLogger('api.query_budget')
+
+query_stats_recorded = Signal(providing_args=('request', 'stats'))
+
+
+class QueryStats:
+    """Запросы к БД, выполненные при обработке одного HTTP-запроса."""
+
+    def __init__(self):
+        self.statements = Counter()
+        self.time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.time += time.perf_counter() - start
+            self.statements[sql] += 1
+
+    @property
+    def count(self):
+        return sum(self.statements.values())
+
+    @property
+    def duplicates(self):
+        return {
+            sql: count for sql, count in self.statements.items() if count > 1
+        }
+
+
+def get_query_budget(url_name):
+    budgets = getattr(settings, 'QUERY_BUDGET', {})
+    return budgets.get('URL_NAMES', {}).get(url_name, budgets.get('DEFAULT'))
+
+
+class QueryBudgetMiddleware:
+    """Считает запросы к БД для каждого запроса к API.
+
+    В режиме DEBUG число запросов, их суммарное время и число повторов
+    отдаются в заголовках ответа. Превышение бюджета из
+    ``settings.QUERY_BUDGET`` для имени URL записывается в журнал;
+    представление может увеличить бюджет запроса атрибутом
+    ``query_budget_extra`` у HTTP-запроса.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = QueryStats()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            response = self.get_response(request)
+
+        url_name = getattr(request.resolver_match, 'url_name', None)
+        duplicates = stats.duplicates
+        if settings.DEBUG:
+            response['X-Query-Count'] = stats.count
+            response['X-Query-Time'] = f'{stats.time * 1000:.2f}'
+            response['X-Query-Duplicates'] = sum(duplicates.values()) - len(
+                duplicates
+            )
+        budget = get_query_budget(url_name)
+        if budget is not None:
+            budget += getattr(request, 'query_budget_extra', 0)
+        if budget is not None and stats.count > budget:
+            logger.warning(
+                '%s %s (%s): %d запросов к БД при бюджете %d, повторы: %s',
+                request.method, request.path, url_name, stats.count, budget,
+                duplicates
+            )
+        query_stats_recorded.send(
+            sender=self.__class__, request=request, stats=stats
+        )
+        return response
+
+
+class CompressionMiddleware:
+    """Сжимает ответы в brotli (если установлен) или gzip.
+
+    Сжимаются ответы с типами из ``settings.COMPRESSION['TYPES']`` не
+    короче ``MIN_SIZE`` байт; потоковые ответы сжимаются по частям.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        options = settings.COMPRESSION
+        content_type = response.get('Content-Type', '').split(';')[0]
+        if (response.has_header('Content-Encoding')
+                or content_type not in options['TYPES']
+                or not response.streaming
+                and len(response.content) < options['MIN_SIZE']):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        if encoding is None:
+            return response
+        level = options['LEVELS'][encoding]
+        if response.streaming:
+            response.streaming_content = compress_sequence(
+                response.streaming_content, encoding, level
+            )
+            del response['Content-Length']
+        else:
+            content = compress(response.content, encoding, level)
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response['Content-Length'] = str(len(content))
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
+
+
+class ReplicaMiddleware:
+    """Отправляет безопасные запросы к вьюсетам с ``replica_reads``
+    на реплики базы данных.
+
+    После успешного небезопасного запроса клиент на время
+    ``settings.DATABASE_REPLICA_LAG`` закрепляется за основной базой.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.replica_token = None
+        try:
+            response = self.get_response(request)
+        finally:
+            if request.replica_token is not None:
+                read_alias.reset(request.replica_token)
+        if (settings.DATABASE_REPLICAS
+                and request.method not in SAFE_METHODS
+                and response.status_code < 400):
+            pin_to_primary(request)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'cls', None)
+        if (request.method not in SAFE_METHODS
+                or not getattr(view_class, 'replica_reads', False)):
+            return None
+        alias = choose_replica(request)
+        if alias is not None:
+            request.replica_token = read_alias.set(alias)
+        return None
@@ -1,7 +1,106 @@
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 from rest_framework import mixins, viewsets
+from rest_framework.response import Response
+
+from api.cache import NotModified, cached_response, make_etag
+from api.replicas import replica_may_lag
+from reviews.generations import get_generations
 
 
 class ListCreateDestroyViewSet(mixins.ListModelMixin, mixins.CreateModelMixin,
                                mixins.DestroyModelMixin,
                                viewsets.GenericViewSet):
     pass
+
+
+class CachedListMixin:
+    """Кеширует ответы list для анонимных GET-запросов.
+
+    Ключ зависит от поколений ``cache_resources``, которые меняются при
+    каждой записи, поэтому устаревшие страницы не отдаются.
+    """
+    cache_resources = ()
+
+    def list(self, request, *args, **kwargs):
+        return cached_response(
+            request,
+            self.cache_resources,
+            lambda: super(CachedListMixin, self).list(
+                request, *args, **kwargs
+            )
+        )
+
+
+class FastListMixin:
+    """list без сериализаторов, строками из ``list_rows_class``.
+
+    Класс строк из ``api.rows`` выдаёт тот же JSON, что и
+    ``get_serializer_class()``; ``None`` возвращает обычный list.
+    """
+    list_rows_class = None
+
+    def list(self, request, *args, **kwargs):
+        if self.list_rows_class is None:
+            return super().list(request, *args, **kwargs)
+        rows = self.list_rows_class()
+        queryset = rows.get_queryset(
+            self.filter_queryset(self.get_queryset())
+        )
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return Response(rows.to_representation(list(queryset)))
+        return self.get_paginated_response(rows.to_representation(page))
+
+
+class ConditionalGetMixin:
+    """ETag и Last-Modified для GET-запросов по версиям данных.
+
+    Версия вычисляется до основного запроса к БД, поэтому на
+    ``If-None-Match`` и ``If-Modified-Since`` ответ 304 отдаётся без
+    выборки и сериализации данных.
+    """
+    cache_resources = ()
+
+    def get_version_stamp(self):
+        """Версия данных ответа и время изменения (или ``None``).
+
+        ``None`` вместо пары отключает условные запросы.
+        """
+        return get_generations(*self.cache_resources), None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.etag = self.last_modified = None
+        if request.method not in ('GET', 'HEAD'):
+            return
+        stamp = self.get_version_stamp()
+        if stamp is None:
+            return
+        version, last_modified = stamp
+        self.etag = make_etag(request, version)
+        if last_modified is not None:
+            self.last_modified = int(last_modified.timestamp())
+        response = get_conditional_response(
+            request, etag=self.etag, last_modified=self.last_modified
+        )
+        if response is not None:
+            raise NotModified(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        if getattr(self, 'etag', None) and (
+            response.status_code == 304
+            or response.status_code == 200 and not replica_may_lag()
+        ):
+            response['ETag'] = self.etag
+            if self.last_modified is not None:
+                response['Last-Modified'] = http_date(self.last_modified)
+        return response
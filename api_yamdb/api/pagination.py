@@ -0,0 +1,208 @@
+import json
+from types import SimpleNamespace
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connection
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import (
+    Cursor,
+    CursorPagination,
+    LimitOffsetPagination
+)
+
+
+class KeysetPagination(CursorPagination):
+    """Курсорная пагинация по составному ключу сортировки.
+
+    Курсор хранит значения всех полей сортировки последней строки
+    страницы, поэтому следующая страница выбирается условием
+    ``(a, b) > (x, y)`` по индексу без OFFSET и без COUNT(*).
+    Сортировка берётся из уже отсортированного queryset и дополняется
+    первичным ключом, если его нет.
+    """
+    page_size_query_param = 'limit'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.base_url = request.build_absolute_uri()
+        self.model = queryset.model
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = self.get_cursor_values()
+
+        queryset = queryset.order_by(*(
+            flip(field) if reverse else field for field in self.ordering
+        ))
+        if position is not None:
+            queryset = queryset.filter(
+                self.get_keyset_filter(position, reverse)
+            )
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_following = len(results) > self.page_size
+        if reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_following
+        else:
+            self.has_next = has_following
+            self.has_previous = position is not None
+        return self.page
+
+    def get_ordering(self, request, queryset, view):
+        ordering = [
+            field for field in (
+                queryset.query.order_by or queryset.model._meta.ordering
+            )
+            if isinstance(field, str)
+        ]
+        if not any(field.lstrip('-') in ('id', 'pk') for field in ordering):
+            descending = bool(ordering) and ordering[-1].startswith('-')
+            ordering.append('-pk' if descending else 'pk')
+        for field in ordering:
+            self.get_model_field(field)
+        return tuple(ordering)
+
+    def get_model_field(self, field):
+        """Поле модели для поля сортировки.
+
+        Ключ курсора строится только по полям модели: по вычисляемым
+        значениям (например, релевантности поиска) курсор недоступен.
+        """
+        meta = self.model._meta
+        name = field.lstrip('-')
+        if name == 'pk':
+            return meta.pk
+        try:
+            return meta.get_field(name)
+        except FieldDoesNotExist:
+            raise ValidationError({
+                self.cursor_query_param: (
+                    f'Курсорная пагинация недоступна при сортировке '
+                    f'по «{name}»; используйте limit и offset'
+                )
+            })
+
+    def get_cursor_values(self):
+        if self.cursor is None or self.cursor.position is None:
+            return None
+        try:
+            values = json.loads(self.cursor.position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return [
+            self.clean_cursor_value(field, value)
+            for field, value in zip(self.ordering, values)
+        ]
+
+    def clean_cursor_value(self, field, value):
+        """Значение курсора, приведённое к типу поля сортировки."""
+        if value is None:
+            return None
+        if isinstance(value, (list, dict)):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            return self.get_model_field(field).to_python(value)
+        except (ValueError, TypeError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_keyset_filter(self, values, reverse):
+        """Строит условие «строго после ключа» с учётом NULL.
+
+        Ведущее поле дополнительно ограничено диапазоном, чтобы
+        планировщик начал просмотр индекса сразу с нужной позиции.
+        """
+        fields = [
+            flip(field) if reverse else field for field in self.ordering
+        ]
+        condition = Q(pk__in=())
+        equal = Q()
+        for field, value in zip(fields, values):
+            condition |= equal & after(field, value)
+            equal &= same(field, value)
+        return (after(fields[0], values[0]) | same(fields[0], values[0])
+                ) & condition
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(Cursor(
+            offset=0, reverse=False, position=self.get_key(self.page[-1])
+        ))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(Cursor(
+            offset=0, reverse=True, position=self.get_key(self.page[0])
+        ))
+
+    def get_key(self, instance):
+        """Ключ строки страницы: объекта модели или словаря ``.values()``."""
+        if isinstance(instance, dict):
+            instance = SimpleNamespace(**instance)
+        values = []
+        for field in self.ordering:
+            model_field = self.get_model_field(field)
+            value = getattr(instance, model_field.attname)
+            values.append(
+                None if value is None else model_field.value_to_string(
+                    instance
+                )
+            )
+        return json.dumps(values)
+
+
+class LimitOffsetOrKeysetPagination(LimitOffsetPagination):
+    """LimitOffset по умолчанию, курсорная пагинация по ``?cursor=``."""
+    keyset_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.keyset_class.cursor_query_param in request.query_params:
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+def flip(field):
+    return field[1:] if field.startswith('-') else f'-{field}'
+
+
+def nulls_first(field):
+    """Идут ли NULL в начале при заданном направлении сортировки."""
+    descending = field.startswith('-')
+    return connection.features.nulls_order_largest == descending
+
+
+def after(field, value):
+    name = field.lstrip('-')
+    if value is None:
+        if nulls_first(field):
+            return Q(**{f'{name}__isnull': False})
+        return Q(pk__in=())
+    lookup = 'lt' if field.startswith('-') else 'gt'
+    condition = Q(**{f'{name}__{lookup}': value})
+    if not nulls_first(field):
+        condition |= Q(**{f'{name}__isnull': True})
+    return condition
+
+
+def same(field, value):
+    name = field.lstrip('-')
+    if value is None:
+        return Q(**{f'{name}__isnull': True})
+    return Q(**{name: value})
@@ -0,0 +1,26 @@
+import io
+
+from django.conf import settings
+from rest_framework import parsers
+
+from api.renderers import FastJSONRenderer, orjson
+
+
+class FastJSONParser(parsers.JSONParser):
+    """JSONParser на orjson для тел в UTF-8.
+
+    Тела, которые orjson не разбирает (числа больше 64 бит, ошибки),
+    передаются стандартному парсеру, чтобы ответ не изменился.
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(body), media_type, parser_context)
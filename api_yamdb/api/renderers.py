@@ -0,0 +1,109 @@
+from rest_framework import renderers
+
+from reviews.export import csv_lines, ndjson_lines
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    ORJSON_OPTIONS = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+# Числа вне этого диапазона repr записывает в экспоненциальной форме,
+# а orjson - по-своему: 1e+16 и 1e16, 1e-05 и 0.00001.
+PLAIN_FLOATS = (1e-4, 1e16)
+
+
+def has_special_floats(data):
+    """Есть ли в данных NaN, бесконечность или число в экспоненциальной
+    записи - их orjson кодирует не так, как json."""
+    low, high = PLAIN_FLOATS
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        kind = type(value)
+        if kind is str or kind is int or value is None:
+            continue
+        if kind is float:
+            if value and not low <= abs(value) < high:
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value)
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+def as_rows(data):
+    """Приводит ответ (объект или список объектов) к заголовку и строкам."""
+    items = data if isinstance(data, list) else [data]
+    header = list(items[0]) if items and isinstance(items[0], dict) else []
+    return header, (
+        [item.get(column) for column in header] for item in items
+    )
+
+
+class NDJSONRenderer(renderers.BaseRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return ''.join(ndjson_lines(*as_rows(data))).encode(self.charset)
+
+
+class CSVRenderer(renderers.BaseRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return ''.join(csv_lines(*as_rows(data))).encode(self.charset)
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """JSONRenderer на orjson с тем же выводом, что и у стандартного.
+
+    Даты, Decimal и прочие типы, которые DRF кодирует по-своему,
+    передаются его ``JSONEncoder``. Без orjson, с отступами, с
+    ``ensure_ascii``, с числами, которые orjson записывает иначе (см.
+    ``has_special_floats``), или при ошибке orjson работает обычный
+    рендерер; он же отклоняет NaN и бесконечность в строгом режиме.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (orjson is None or data is None or self.ensure_ascii
+                or not self.compact or self.get_indent(
+                    accepted_media_type, renderer_context or {}
+                ) is not None or has_special_floats(data)):
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        encode = self.encoder_class().default
+
+        def default(obj):
+            value = encode(obj)
+            if has_special_floats(value):
+                raise TypeError('Число кодируется обычным рендерером')
+            return value
+
+        try:
+            ret = orjson.dumps(data, default=default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        # Как и JSONRenderer, экранирует разделители строк для JavaScript.
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(
+            b'\xe2\x80\xa9', b'\\u2029'
+        )
@@ -0,0 +1,80 @@
+"""Чтение безопасных запросов к API с реплик базы данных.
+
+Реплики перечислены в ``settings.DATABASE_REPLICAS``. Клиент, который
+только что писал, ``DATABASE_REPLICA_LAG`` секунд читает с основной базы
+и видит свои изменения. Пока после любой записи не прошло столько же
+времени, ответы с реплик могут отставать: они не получают ETag и не
+попадают в кеш ответов.
+"""
+import hashlib
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+LAST_WRITE_KEY = 'replicas:last-write'
+
+read_alias = ContextVar('replica_read_alias', default=None)
+
+
+def pin_key(request):
+    """Ключ клиента: заголовок Authorization или cookie сессии."""
+    credentials = request.META.get('HTTP_AUTHORIZATION') or (
+        request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    )
+    if not credentials:
+        return None
+    return 'replicas:pin:' + hashlib.sha1(credentials.encode()).hexdigest()
+
+
+def pin_to_primary(request):
+    """Отмечает запись: клиент читает с основной базы, пока реплики
+    догоняют её."""
+    lag = settings.DATABASE_REPLICA_LAG
+    cache.set(LAST_WRITE_KEY, True, lag)
+    key = pin_key(request)
+    if key is not None:
+        cache.set(key, True, lag)
+
+
+def choose_replica(request):
+    """Реплика для чтения или ``None``, если читать с основной базы."""
+    if not settings.DATABASE_REPLICAS:
+        return None
+    key = pin_key(request)
+    if key is not None and cache.get(key):
+        return None
+    return random.choice(settings.DATABASE_REPLICAS)
+
+
+def replica_may_lag():
+    """Данные запроса прочитаны с реплики, которая может отставать."""
+    return read_alias.get() is not None and bool(cache.get(LAST_WRITE_KEY))
+
+
+def replicate(target, source='default'):
+    """Копирует базу SQLite ``source`` в ``target``.
+
+    Заменяет репликацию при локальном запуске с файлами SQLite.
+    """
+    connections[source].ensure_connection()
+    connections[target].ensure_connection()
+    connections[source].connection.backup(connections[target].connection)
+
+
+class ReplicaRouter:
+    """Направляет чтение на реплику, выбранную ``ReplicaMiddleware``."""
+
+    def db_for_read(self, model, **hints):
+        return read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db not in settings.DATABASE_REPLICAS
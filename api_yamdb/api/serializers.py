@@ -1,6 +1,7 @@
 from django.conf import settings
 from rest_framework import relations, serializers
 
+from reviews.lookups import categories, genres
 from reviews.validators import validate_username, validate_year
 from reviews.models import (
     Category,
@@ -12,6 +13,23 @@ from reviews.models import (
 )
 
 
+class CachedSlugRelatedField(serializers.SlugRelatedField):
+    """Поиск объекта по slug в таблице из памяти вместо запроса к БД."""
+
+    def __init__(self, table, **kwargs):
+        self.table = table
+        super().__init__(queryset=table.model.objects.all(), **kwargs)
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            self.fail('invalid')
+        obj = self.table.get_by_slug(data)
+        if obj is None:
+            self.fail('does_not_exist', slug_name=self.slug_field,
+                      value=data)
+        return obj
+
+
 class UserSerializer(serializers.ModelSerializer):
 
     class Meta:
@@ -71,7 +89,7 @@ class ReviewSerializer(serializers.ModelSerializer):
         title_id = (self.context.get('request').parser_context.
                     get('kwargs').get('title_id'))
         author = self.context.get('request').user
-        if Review.objects.filter(title=title_id, author=author).exists():
+        if Review.objects.filter(title=title_id, author=author.pk).exists():
             raise serializers.ValidationError((
                 'Пользователь может написать только один отзыв '
                 'на каждое произведение'))
@@ -115,18 +133,27 @@ class TitleReadSerializer(serializers.ModelSerializer):
         read_only_fields = ('__all__',)
 
 
+class TitleSuggestSerializer(serializers.ModelSerializer):
+    rating = serializers.IntegerField()
+
+    class Meta:
+        model = Title
+        fields = ('id', 'name', 'year', 'rating')
+        read_only_fields = ('__all__',)
+
+
 class TitleSerializer(serializers.ModelSerializer):
-    category = serializers.SlugRelatedField(
+    category = CachedSlugRelatedField(
+        categories,
         slug_field='slug',
-        many=False,
-        queryset=Category.objects.all()
+        many=False
     )
-    genre = serializers.SlugRelatedField(
+    genre = CachedSlugRelatedField(
+        genres,
         slug_field='slug',
-        many=True,
-        queryset=Genre.objects.all()
+        many=True
     )
-    rating = serializers.IntegerField(required=False)
+    rating = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Title
@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from api.authentication import remember_user_state
+from reviews.models import User
+
+
+@receiver(post_save, sender=User)
+def update_user_state(sender, instance, **kwargs):
+    remember_user_state(instance)
+
+
+@receiver(post_delete, sender=User)
+def delete_user_state(sender, instance, **kwargs):
+    remember_user_state(instance, deleted=True)
@@ -0,0 +1,41 @@
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import StaticFilesStorage
+
+from api.compression import ENCODINGS, EXTENSIONS, compress
+
+
+class PrecompressedStaticFilesStorage(StaticFilesStorage):
+    """Кладёт рядом со статическими файлами их сжатые копии.
+
+    При collectstatic для текстовых файлов создаются ``*.gz`` и (если
+    установлен brotli) ``*.br``, которые веб-сервер отдаёт без сжатия
+    на каждый запрос (``gzip_static`` / ``brotli_static`` в nginx).
+    """
+    compressible_extensions = (
+        '.css', '.html', '.js', '.json', '.map', '.svg', '.txt', '.xml',
+        '.yaml', '.yml',
+    )
+
+    def post_process(self, paths, dry_run=False, **options):
+        if dry_run:
+            return
+        for name in paths:
+            if os.path.splitext(name)[1] not in self.compressible_extensions:
+                continue
+            with self.open(name) as source:
+                content = source.read()
+            if len(content) < settings.COMPRESSION['MIN_SIZE']:
+                continue
+            for encoding in ENCODINGS:
+                compressed = compress(
+                    content, encoding,
+                    settings.COMPRESSION['STATIC_LEVELS'][encoding]
+                )
+                if len(compressed) >= len(content):
+                    continue
+                path = self.path(name + EXTENSIONS[encoding])
+                with open(path, 'wb') as target:
+                    target.write(compressed)
+            yield name, name, True
@@ -0,0 +1,107 @@
+"""Ограничение частоты запросов к /auth/ скользящим окном.
+
+Вместо журнала времени всех запросов (``SimpleRateThrottle``) хранятся
+два счётчика: за текущее и предыдущее окно. Число запросов за последние
+``duration`` секунд оценивается как текущий счётчик плюс доля
+предыдущего, пропорциональная ещё не вышедшей из окна части.
+Счётчики лежат в локальном кеше ``settings.THROTTLE_CACHE_ALIAS``,
+поэтому отклонённый запрос не обращается к базе данных.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """Пропускает не больше ``num_requests`` запросов за ``duration``
+    секунд для каждого ключа из ``get_cache_keys``."""
+
+    def __init__(self):
+        self.cache = caches[settings.THROTTLE_CACHE_ALIAS]
+        super().__init__()
+
+    def get_rate(self):
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def get_cache_keys(self, request, view):
+        raise NotImplementedError
+
+    def window_keys(self, key, window):
+        return f'{key}:{window}', f'{key}:{window - 1}'
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        keys = self.get_cache_keys(request, view)
+        if not keys:
+            return True
+        now = self.timer()
+        window = int(now // self.duration)
+        elapsed = now - window * self.duration
+        counts = self.cache.get_many([
+            window_key for key in keys
+            for window_key in self.window_keys(key, window)
+        ])
+        waits = [
+            self.get_wait(
+                *(counts.get(window_key, 0)
+                  for window_key in self.window_keys(key, window)),
+                elapsed
+            )
+            for key in keys
+        ]
+        if any(wait is not None for wait in waits):
+            self.wait_seconds = max(wait or 0 for wait in waits)
+            return False
+        for key in keys:
+            current_key, _ = self.window_keys(key, window)
+            self.cache.add(current_key, 0, 2 * self.duration)
+            self.cache.incr(current_key)
+        return True
+
+    def get_wait(self, current, previous, elapsed):
+        """Через сколько секунд оценка опустится ниже лимита или
+        ``None``, если запрос можно пропустить."""
+        duration, limit = self.duration, self.num_requests
+        if current + previous * (1 - elapsed / duration) < limit:
+            return None
+        if current < limit:
+            return duration * (1 - (limit - current) / previous) - elapsed
+        return duration - elapsed + duration * (1 - limit / current)
+
+    def wait(self):
+        # Сразу после превышения оценка лишь чуть выше лимита.
+        return max(self.wait_seconds, 1)
+
+
+class AuthIPThrottle(SlidingWindowThrottle):
+    """Лимит запросов к /auth/ с одного IP-адреса."""
+    scope = 'auth_ip'
+
+    def get_cache_keys(self, request, view):
+        return [self.cache_format % {
+            'scope': self.scope, 'ident': self.get_ident(request)
+        }]
+
+
+class AuthIdentityThrottle(SlidingWindowThrottle):
+    """Лимит запросов к /auth/ для одного имени пользователя и адреса
+    электронной почты, откуда бы они ни приходили."""
+    scope = 'auth_identity'
+    fields = ('username', 'email')
+
+    def get_cache_keys(self, request, view):
+        data = request.data if isinstance(request.data, dict) else {}
+        keys = []
+        for field in self.fields:
+            value = data.get(field)
+            if isinstance(value, str) and value.strip():
+                ident = f'{field}:{value.strip().casefold()}'
+                keys.append(self.cache_format % {
+                    'scope': self.scope,
+                    'ident': hashlib.sha1(ident.encode()).hexdigest(),
+                })
+        return keys
@@ -1,4 +1,4 @@
-from django.urls import include, path
+from django.urls import include, path, re_path
 from rest_framework.routers import SimpleRouter
 
 from api.views import (
@@ -8,6 +8,7 @@ from api.views import (
     ReviewViewSet,
     TitleViewSet,
     UserViewSet,
+    export,
     signup,
     token
 )
@@ -36,7 +37,15 @@ signup_token_urlpatterns = [
     path('auth/signup/', signup),
     path('auth/token/', token),
 ]
+export_urlpatterns = [
+    re_path(
+        r'^export/(?P<resource>titles|reviews|comments)/$',
+        export,
+        name='export'
+    ),
+]
 urlpatterns = [
     path('v1/', include(signup_token_urlpatterns)),
+    path('v1/', include(export_urlpatterns)),
     path('v1/', include(router_v1.urls)),
 ]
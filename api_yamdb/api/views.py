@@ -1,26 +1,47 @@
 import random
 
 from django.conf import settings
-from django.core.mail import send_mail
-from django.db import IntegrityError
-from django.db.models import Avg
+from django.db import IntegrityError, transaction
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters import rest_framework as rest_filters
 from rest_framework import filters, status, viewsets
-from rest_framework.decorators import action, api_view
+from rest_framework.decorators import (
+    action,
+    api_view,
+    permission_classes,
+    renderer_classes,
+    throttle_classes
+)
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import (
     IsAuthenticated,
     IsAuthenticatedOrReadOnly
 )
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
 
-from api.mixins import ListCreateDestroyViewSet
+from api.authentication import access_token_for_user
+from api.filters import (
+    FullTextSearchFilter,
+    StableOrderingFilter,
+    TitleFilter
+)
+from api.cache import cached_response
+from api.mixins import (
+    CachedListMixin,
+    ConditionalGetMixin,
+    FastListMixin,
+    ListCreateDestroyViewSet
+)
+from api.pagination import LimitOffsetOrKeysetPagination
 from api.permissions import (
     IsAdmin,
     OwnerModeratorOrReadOnly,
     ReadOnly
 )
+from api.renderers import CSVRenderer, NDJSONRenderer
+from api.replicas import replica_may_lag
+from api.rows import CommentRows, ReviewRows, TitleRows
 from api.serializers import (
     CategorySerializer,
     CommentSerializer,
@@ -30,10 +51,32 @@ from api.serializers import (
     SignupSerializer,
     TitleSerializer,
     TitleReadSerializer,
+    TitleSuggestSerializer,
     TokenSerializer,
     UserSerializer
 )
+from api.throttling import AuthIdentityThrottle, AuthIPThrottle
+from reviews.export import export_lines
+from reviews.facets import FACET_QUERIES, FACETS, title_facets
+from reviews.generations import (
+    AUTHORS,
+    CATEGORIES,
+    COMMENTS,
+    GENRES,
+    REVIEWS,
+    TITLES,
+    get_generations
+)
+from reviews.lookups import categories, genres
 from reviews.models import Category, Genre, Review, Title, User
+from reviews.outbox import queue_email
+from reviews.search import suggest_titles
+
+EXPORT_FILES = {
+    'titles': 'titles.csv',
+    'reviews': 'review.csv',
+    'comments': 'comments.csv',
+}
 
 
 class UserViewSet(viewsets.ModelViewSet):
@@ -47,7 +90,7 @@ class UserViewSet(viewsets.ModelViewSet):
     @action(methods=['get', 'patch'], detail=False, url_path='me',
             permission_classes=(IsAuthenticated,))
     def profile(self, request):
-        user = self.request.user
+        user = get_object_or_404(User, pk=request.user.pk)
         if request.method != 'PATCH':
             return Response(ProfileSerializer(user).data)
         serializer = ProfileSerializer(
@@ -61,6 +104,7 @@ class UserViewSet(viewsets.ModelViewSet):
 
 
 @api_view(['POST'])
+@throttle_classes((AuthIPThrottle, AuthIdentityThrottle))
 def signup(request):
     serializer = SignupSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
@@ -77,14 +121,14 @@ def signup(request):
                         status=status.HTTP_400_BAD_REQUEST)
 
     user.confirmation_code = ''.join(random.sample('0123456789', 8))
-    user.save()
-    send_mail(
-        'Код подтверждения YaMDb',
-        f'Ваш код подтверждения: {user.confirmation_code}',
-        settings.EMAIL_SIGNUP,
-        [email],
-        fail_silently=False
-    )
+    with transaction.atomic():
+        user.save()
+        queue_email(
+            'Код подтверждения YaMDb',
+            f'Ваш код подтверждения: {user.confirmation_code}',
+            settings.EMAIL_SIGNUP,
+            email
+        )
     return Response(serializer.data)
 
 
@@ -94,6 +138,7 @@ def clean_confirmation_code(user):
 
 
 @api_view(['POST'])
+@throttle_classes((AuthIPThrottle, AuthIdentityThrottle))
 def token(request):
     serializer = TokenSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
@@ -101,7 +146,7 @@ def token(request):
     if serializer.data['confirmation_code'] == user.confirmation_code:
         clean_confirmation_code(user)
         return Response(
-            {'token': str(RefreshToken.for_user(user).access_token)},
+            {'token': str(access_token_for_user(user))},
             status=status.HTTP_201_CREATED
         )
     clean_confirmation_code(user)
@@ -111,33 +156,76 @@ def token(request):
     )
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+@api_view(['GET'])
+@permission_classes((IsAdmin,))
+@renderer_classes((NDJSONRenderer, CSVRenderer))
+def export(request, resource):
+    renderer = request.accepted_renderer
+    response = StreamingHttpResponse(
+        export_lines(EXPORT_FILES[resource], renderer.format),
+        content_type=f'{renderer.media_type}; charset={renderer.charset}'
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="{resource}.{renderer.format}"'
+    )
+    return response
+
+
+class ReviewViewSet(ConditionalGetMixin, CachedListMixin, FastListMixin,
+                    viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
+    list_rows_class = ReviewRows
     permission_classes = (IsAuthenticatedOrReadOnly, OwnerModeratorOrReadOnly,)
-    filter_backends = (filters.SearchFilter,)
-    search_fields = ('text', 'author')
+    pagination_class = LimitOffsetOrKeysetPagination
+    filter_backends = (FullTextSearchFilter,)
+    cache_resources = (REVIEWS,)
+    replica_reads = True
+
+    title = None
 
     def get_title(self):
-        return get_object_or_404(Title, id=self.kwargs.get('title_id'))
+        if self.title is None:
+            self.title = get_object_or_404(
+                Title, id=self.kwargs.get('title_id')
+            )
+        return self.title
+
+    def get_version_stamp(self):
+        self.title = Title.objects.filter(
+            id=self.kwargs.get('title_id')
+        ).first()
+        if self.title is None:
+            return None
+        updated_at = self.title.updated_at
+        return (updated_at.isoformat(), get_generations(AUTHORS)), updated_at
 
     def get_queryset(self):
-        return self.get_title().reviews.all()
+        return self.get_title().reviews.select_related('author')
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, title=self.get_title())
+        serializer.save(
+            author_id=self.request.user.pk, title=self.get_title()
+        )
 
 
 class CommentViewSet(ReviewViewSet):
     serializer_class = CommentSerializer
+    list_rows_class = CommentRows
+    cache_resources = (COMMENTS, AUTHORS)
+
+    def get_version_stamp(self):
+        return ConditionalGetMixin.get_version_stamp(self)
 
     def get_review(self):
         return get_object_or_404(Review, id=self.kwargs.get('review_id'))
 
     def get_queryset(self):
-        return self.get_review().comments.all()
+        return self.get_review().comments.select_related('author')
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, review=self.get_review())
+        serializer.save(
+            author_id=self.request.user.pk, review=self.get_review()
+        )
 
 
 class BasePermissionAndSearchFilter(ListCreateDestroyViewSet):
@@ -145,42 +233,124 @@ class BasePermissionAndSearchFilter(ListCreateDestroyViewSet):
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
     lookup_field = 'slug'
+    lookup_table = None
+
+    def list(self, request, *args, **kwargs):
+        objects = self.lookup_table.search(
+            filters.SearchFilter().get_search_terms(request)
+        )
+        page = self.paginate_queryset(objects)
+        if page is None:
+            return Response(self.get_serializer(objects, many=True).data)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
 
-class CategoryViewSet(BasePermissionAndSearchFilter):
+class CategoryViewSet(ConditionalGetMixin, CachedListMixin,
+                      BasePermissionAndSearchFilter):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    lookup_table = categories
+    cache_resources = (CATEGORIES,)
+    replica_reads = True
 
 
-class GenreViewSet(BasePermissionAndSearchFilter):
+class GenreViewSet(ConditionalGetMixin, CachedListMixin,
+                   BasePermissionAndSearchFilter):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    lookup_table = genres
+    cache_resources = (GENRES,)
+    replica_reads = True
 
 
-class TitleFilter(rest_filters.FilterSet):
-    genre = rest_filters.CharFilter(field_name='genre__slug')
-    category = rest_filters.CharFilter(field_name='category__slug')
-    name = rest_filters.CharFilter(field_name='name', lookup_expr='icontains')
-
-    class Meta:
-        model = Title
-        fields = ('category', 'genre', 'name', 'year')
-
-
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.prefetch_related(
-        'category', 'genre'
-    ).annotate(rating=Avg('reviews__score'))
+class TitleViewSet(ConditionalGetMixin, CachedListMixin, FastListMixin,
+                   viewsets.ModelViewSet):
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre')
     serializer_class = TitleSerializer
+    list_rows_class = TitleRows
     permission_classes = (IsAdmin | ReadOnly,)
+    pagination_class = LimitOffsetOrKeysetPagination
     filter_backends = (
         rest_filters.DjangoFilterBackend,
-        filters.OrderingFilter,
+        StableOrderingFilter,
     )
     filterset_class = TitleFilter
-    ordering_fields = ('-rating',)
+    ordering_fields = ('rating', 'year', 'name', 'review_count')
+    ordering = ('name',)
+    cache_resources = (TITLES,)
+    replica_reads = True
+
+    def get_version_stamp(self):
+        if self.action != 'retrieve':
+            return super().get_version_stamp()
+        updated_at = Title.objects.filter(
+            pk=self.kwargs.get('pk')
+        ).values_list('updated_at', flat=True).first()
+        if updated_at is None:
+            return None
+        version = (updated_at.isoformat(), get_generations(CATEGORIES, GENRES))
+        return version, updated_at
 
     def get_serializer_class(self):
         if self.action in ('retrieve', 'list'):
             return TitleReadSerializer
+        if self.action == 'suggest':
+            return TitleSuggestSerializer
         return TitleSerializer
+
+    def get_facet_names(self):
+        names = [
+            name.strip() for name in
+            self.request.query_params.get('facets', '').split(',')
+            if name.strip()
+        ]
+        unknown = [name for name in names if name not in FACETS]
+        if unknown:
+            raise ValidationError({'facets': (
+                f'Неизвестные поля: {", ".join(unknown)}. '
+                f'Доступны: {", ".join(FACETS)}.'
+            )})
+        return names
+
+    def list(self, request, *args, **kwargs):
+        self.facet_names = self.get_facet_names()
+        request._request.query_budget_extra = sum(
+            FACET_QUERIES[name] for name in self.facet_names
+        )
+        return super().list(request, *args, **kwargs)
+
+    def get_paginated_response(self, data):
+        """Добавляет к странице счётчики ``?facets=`` по текущему фильтру."""
+        response = super().get_paginated_response(data)
+        if self.facet_names:
+            # Счётчики с отстающей реплики не кешируются.
+            filtered = replica_may_lag() or any(
+                name in self.request.query_params
+                for name in self.filterset_class.base_filters
+            )
+            response.data['facets'] = title_facets(
+                self.filter_queryset(self.get_queryset()),
+                self.facet_names,
+                filtered
+            )
+        return response
+
+    @action(detail=False, url_path='suggest', pagination_class=None)
+    def suggest(self, request):
+        """Подсказки названий по префиксу ``?q=``, лучшие по рейтингу."""
+        try:
+            limit = int(request.query_params.get(
+                'limit', settings.TITLE_SUGGEST_LIMIT
+            ))
+        except ValueError:
+            limit = settings.TITLE_SUGGEST_LIMIT
+        limit = max(1, min(limit, settings.TITLE_SUGGEST_MAX_LIMIT))
+        return cached_response(request, self.cache_resources, lambda: Response(
+            self.get_serializer(
+                suggest_titles(request.query_params.get('q', ''), limit),
+                many=True
+            ).data
+        ))
@@ -24,6 +24,9 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'api.middleware.CompressionMiddleware',
+    'api.middleware.QueryBudgetMiddleware',
+    'api.middleware.ReplicaMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -53,13 +56,86 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
-DATABASES = {
-    'default': {
+# Профиль базы данных выбирается переменной окружения YAMDB_DB_PROFILE.
+# 'sqlite-prod' держит соединения открытыми и переводит SQLite в режим
+# WAL: чтение не ждёт записи, а писатели ждут друг друга busy_timeout мс.
+# PRAGMAS выполняются при каждом новом соединении (reviews.signals).
+DATABASE_PROFILES = {
+    'sqlite': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+    },
+    'sqlite-prod': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
-    }
+        'CONN_MAX_AGE': 600,
+        'PRAGMAS': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'mmap_size': 256 * 1024 * 1024,
+            'cache_size': -64 * 1024,
+            'busy_timeout': 5000,
+            'temp_store': 'MEMORY',
+        },
+    },
+}
+DATABASE_PROFILE = os.environ.get('YAMDB_DB_PROFILE', 'sqlite')
+
+DATABASES = {
+    'default': DATABASE_PROFILES[DATABASE_PROFILE],
 }
 
+# Реплики только для чтения перечисляются в YAMDB_DB_REPLICAS через
+# запятую. Локально каждая реплика - файл db.<имя>.sqlite3, который
+# обновляет команда sync_replicas.
+DATABASE_REPLICAS = tuple(
+    alias for alias in os.environ.get('YAMDB_DB_REPLICAS', '').split(',')
+    if alias
+)
+for alias in DATABASE_REPLICAS:
+    DATABASES[alias] = dict(
+        DATABASES['default'],
+        NAME=os.path.join(BASE_DIR, f'db.{alias}.sqlite3'),
+        TEST={'MIRROR': 'default'},
+    )
+DATABASE_ROUTERS = ['api.replicas.ReplicaRouter']
+# Наибольшее отставание реплик в секундах: столько клиент после записи
+# читает с основной базы.
+DATABASE_REPLICA_LAG = 5
+
+# Поколения ресурсов, версии справочников и состояние пользователей
+# хранятся в 'default': для нескольких процессов он должен быть общим.
+# Его задают YAMDB_CACHE_BACKEND и YAMDB_CACHE_LOCATION, например
+# django.core.cache.backends.memcached.MemcachedCache и 127.0.0.1:11211;
+# иначе проверка api.W001 предупреждает о кеше в памяти процесса.
+# Ответы можно кешировать локально.
+# Счётчики лимитов запросов в 'throttle' локальны: каждый процесс
+# считает свои запросы, и проверка лимита не ходит по сети.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'YAMDB_CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.environ.get('YAMDB_CACHE_LOCATION', ''),
+    },
+    'throttle': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'throttle',
+    },
+    'responses': {
+        'BACKEND': 'api.cache.MemoryBoundedLocMemCache',
+        'LOCATION': 'responses',
+        'TIMEOUT': 300,
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+            'MAX_BYTES': 64 * 1024 * 1024,
+        },
+    },
+}
+RESPONSE_CACHE_ALIAS = 'responses'
+THROTTLE_CACHE_ALIAS = 'throttle'
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -88,32 +164,111 @@ USE_TZ = True
 STATIC_URL = '/static/'
 
 STATICFILES_DIRS = (os.path.join(BASE_DIR, 'static/'),)
+STATIC_ROOT = os.path.join(BASE_DIR, 'collected_static')
+STATICFILES_STORAGE = 'api.storage.PrecompressedStaticFilesStorage'
 
 AUTH_USER_MODEL = 'reviews.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.StatelessJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
     'PAGE_SIZE': 5,
     'DEFAULT_FILTER_BACKENDS': (
         'django_filters.rest_framework.DjangoFilterBackend',
     ),
+    # Лимиты для /auth/signup/ и /auth/token/ (api.throttling): с одного
+    # IP-адреса и для одного имени пользователя или адреса почты.
+    'DEFAULT_THROTTLE_RATES': {
+        'auth_ip': '30/min',
+        'auth_identity': '5/min',
+    },
+    # Число доверенных прокси перед приложением: адрес клиента берётся
+    # из X-Forwarded-For только на столько шагов, иначе - REMOTE_ADDR.
+    'NUM_PROXIES': int(os.environ.get('YAMDB_NUM_PROXIES', 0)),
 }
 
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
+# Сколько секунд роль и активность пользователя берутся из кеша, а не
+# из базы: столько могут действовать изменения в обход сигналов
+# (QuerySet.update, load_csv --mode=upsert).
+AUTH_USER_STATE_TIMEOUT = 300
+
+LOOKUP_CACHE_CHECK_INTERVAL = 1
+
+QUERY_BUDGET = {
+    'DEFAULT': 10,
+    'URL_NAMES': {
+        'category-list': 3,
+        'genre-list': 3,
+        'title-list': 4,
+        'title-detail': 3,
+        'review-list': 4,
+        'review-detail': 4,
+        'comment-list': 4,
+        'comment-detail': 4,
+    },
+}
 
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
 EMAIL_SIGNUP = 'signup@yamdb.com'
+# Письма копятся в таблице reviews.OutboxEmail и уходят командой
+# send_outbox: до MAX_ATTEMPTS попыток с паузой BACKOFF * 2^n секунд, но
+# не больше MAX_BACKOFF; взятое обработчиком письмо ждёт LEASE секунд.
+EMAIL_OUTBOX = {
+    'BATCH_SIZE': 100,
+    'MAX_ATTEMPTS': 8,
+    'BACKOFF': 30,
+    'MAX_BACKOFF': 3600,
+    'LEASE': 300,
+}
 LENGTH_CONFIRMATION_CODE = 8
 LENGTH_EMAIL_FIELD = 254
 LENGTH_USERNAME_FIELD = 150
+LENGTH_NAME_NORMALIZED_FIELD = 256
+
+TITLE_SUGGEST_LIMIT = 10
+TITLE_SUGGEST_MAX_LIMIT = 50
+# Подсказки хранятся для префиксов названий не длиннее этого числа
+# символов. После изменения таблицу reviews.TitlePrefix нужно заполнить
+# заново функцией reviews.search.rebuild_title_prefixes.
+TITLE_SUGGEST_PREFIX_LENGTH = 20
+
+COMPRESSION = {
+    'MIN_SIZE': 1024,
+    'TYPES': (
+        'application/json',
+        'application/x-ndjson',
+        'application/javascript',
+        'application/x-yaml',
+        'image/svg+xml',
+        'text/css',
+        'text/csv',
+        'text/html',
+        'text/javascript',
+        'text/plain',
+        'text/yaml',
+    ),
+    # Уровень gzip и качество brotli: для ответов - быстрое сжатие,
+    # для статики при collectstatic - максимальное.
+    'LEVELS': {'gzip': 6, 'br': 4},
+    'STATIC_LEVELS': {'gzip': 9, 'br': 11},
+}
@@ -5,6 +5,7 @@ from reviews.models import (
     Comment,
     Genre,
     GenreTitle,
+    OutboxEmail,
     Review,
     Title,
     User
@@ -25,10 +26,20 @@ class CommentAdmin(admin.ModelAdmin):
     empty_value_display = '-пусто-'
 
 
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'id', 'recipient', 'subject', 'created_at', 'attempts', 'sent_at'
+    )
+    search_fields = ('recipient',)
+    list_filter = ('sent_at',)
+    empty_value_display = '-пусто-'
+
+
 admin.site.register(Category)
 admin.site.register(Comment, CommentAdmin)
 admin.site.register(Genre)
 admin.site.register(GenreTitle)
+admin.site.register(OutboxEmail, OutboxEmailAdmin)
 admin.site.register(Review, ReviewAdmin)
 admin.site.register(Title)
 admin.site.register(User)
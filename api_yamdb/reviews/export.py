@@ -0,0 +1,97 @@
+import csv
+import datetime as dt
+import json
+
+from reviews.models import (
+    Category,
+    Comment,
+    Genre,
+    GenreTitle,
+    Review,
+    Title,
+    User
+)
+
+CSV = 'csv'
+NDJSON = 'ndjson'
+
+# Файл -> модель и пары (столбец csv, поле модели) в формате load_csv.
+TABLES = {
+    'users.csv': (User, (
+        ('id', 'id'), ('username', 'username'), ('email', 'email'),
+        ('role', 'role'), ('bio', 'bio'), ('first_name', 'first_name'),
+        ('last_name', 'last_name'),
+    )),
+    'category.csv': (Category, (
+        ('id', 'id'), ('name', 'name'), ('slug', 'slug'),
+    )),
+    'genre.csv': (Genre, (
+        ('id', 'id'), ('name', 'name'), ('slug', 'slug'),
+    )),
+    'titles.csv': (Title, (
+        ('id', 'id'), ('name', 'name'), ('year', 'year'),
+        ('category', 'category_id'),
+    )),
+    'review.csv': (Review, (
+        ('id', 'id'), ('title_id', 'title_id'), ('text', 'text'),
+        ('author', 'author_id'), ('score', 'score'),
+        ('pub_date', 'pub_date'),
+    )),
+    'comments.csv': (Comment, (
+        ('id', 'id'), ('review_id', 'review_id'), ('text', 'text'),
+        ('author', 'author_id'), ('pub_date', 'pub_date'),
+    )),
+    'genre_title.csv': (GenreTitle, (
+        ('id', 'id'), ('title_id', 'title_id'), ('genre_id', 'genre_id'),
+    )),
+}
+
+
+def export_value(value):
+    if isinstance(value, dt.datetime):
+        return value.astimezone(dt.timezone.utc).isoformat().replace(
+            '+00:00', 'Z'
+        )
+    return value
+
+
+def table_rows(file_name, chunk_size=2000):
+    """Заголовок и поток строк таблицы без создания объектов моделей."""
+    model, columns = TABLES[file_name]
+    rows = model.objects.order_by('pk').values_list(
+        *(field for _, field in columns)
+    ).iterator(chunk_size=chunk_size)
+    header = [column for column, _ in columns]
+    return header, (tuple(map(export_value, row)) for row in rows)
+
+
+class LineBuffer:
+    """Файлоподобный объект, который возвращает записанную строку."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(header, rows):
+    writer = csv.writer(LineBuffer())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(
+            ['' if value is None else value for value in row]
+        )
+
+
+def ndjson_lines(header, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(header, row)), ensure_ascii=False) + '\n'
+
+
+FORMATTERS = {
+    CSV: csv_lines,
+    NDJSON: ndjson_lines,
+}
+
+
+def export_lines(file_name, output_format=CSV, chunk_size=2000):
+    header, rows = table_rows(file_name, chunk_size)
+    return FORMATTERS[output_format](header, rows)
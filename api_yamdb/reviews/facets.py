@@ -0,0 +1,76 @@
+"""Число произведений по жанрам, категориям и годам для каталога."""
+from django.core.cache import cache
+from django.db.models import Count
+
+from reviews.generations import TITLES, get_generations
+from reviews.lookups import categories, genres
+from reviews.models import GenreTitle
+
+
+def lookup_counts(table, rows, field):
+    """Счётчики по объектам справочника, от самых частых."""
+    result = []
+    for row in rows:
+        obj = table.get_by_id(row[field])
+        if obj is not None:
+            result.append(
+                {'slug': obj.slug, 'name': obj.name, 'count': row['count']}
+            )
+    return sorted(result, key=lambda item: (-item['count'], item['slug']))
+
+
+def genre_counts(titles):
+    rows = GenreTitle.objects.filter(
+        title__in=titles.order_by().values('pk')
+    ).order_by().values('genre_id').annotate(
+        count=Count('title_id', distinct=True)
+    )
+    return lookup_counts(genres, rows, 'genre_id')
+
+
+def category_counts(titles):
+    rows = titles.exclude(category=None).order_by().values(
+        'category_id'
+    ).annotate(count=Count('pk', distinct=True))
+    return lookup_counts(categories, rows, 'category_id')
+
+
+def year_counts(titles):
+    rows = titles.order_by().values('year').annotate(
+        count=Count('pk', distinct=True)
+    ).order_by('year')
+    return [{'value': row['year'], 'count': row['count']} for row in rows]
+
+
+FACETS = {
+    'genre': genre_counts,
+    'category': category_counts,
+    'year': year_counts,
+}
+# Наибольшее число запросов к БД на фасет: агрегат и, для справочников,
+# загрузка таблицы в память процесса.
+FACET_QUERIES = {
+    'genre': 2,
+    'category': 2,
+    'year': 1,
+}
+
+
+def title_facets(titles, names, filtered=True):
+    """Счётчики ``names`` по произведениям ``titles``, один запрос на поле.
+
+    Счётчики по всему каталогу (``filtered=False``) кешируются до
+    следующего изменения произведений.
+    """
+    if filtered:
+        return {name: FACETS[name](titles) for name in names}
+    generation, = get_generations(TITLES)
+    keys = {name: f'facets:{name}:{generation}' for name in names}
+    cached = cache.get_many(list(keys.values()))
+    result = {}
+    for name, key in keys.items():
+        if key not in cached:
+            cached[key] = FACETS[name](titles)
+            cache.set(key, cached[key])
+        result[name] = cached[key]
+    return result
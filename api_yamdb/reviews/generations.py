@@ -0,0 +1,53 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+TITLES = 'titles'
+CATEGORIES = 'categories'
+GENRES = 'genres'
+REVIEWS = 'reviews'
+COMMENTS = 'comments'
+AUTHORS = 'authors'
+RESOURCES = (TITLES, CATEGORIES, GENRES, REVIEWS, COMMENTS, AUTHORS)
+
+
+def generation_key(resource):
+    return f'generation:{resource}'
+
+
+def new_generation():
+    # Счётчик, потерянный кешем, продолжается с большего значения,
+    # поэтому старые ключи с прежним поколением не совпадут с новыми.
+    return time.time_ns()
+
+
+def get_generations(*resources):
+    """Текущие поколения ресурсов, меняющиеся при каждой записи."""
+    keys = [generation_key(resource) for resource in resources]
+    stored = cache.get_many(keys)
+    missing = {key: new_generation() for key in keys if key not in stored}
+    for key, value in missing.items():
+        cache.add(key, value, None)
+    if missing:
+        stored.update(cache.get_many(list(missing)))
+    return tuple(stored.get(key, missing.get(key)) for key in keys)
+
+
+def bump(*resources):
+    for resource in resources:
+        key = generation_key(resource)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, new_generation(), None)
+
+
+def bump_on_commit(*resources):
+    """Меняет поколения сейчас и ещё раз после фиксации транзакции.
+
+    Повторная смена нужна, чтобы ответ, закешированный конкурентным
+    запросом до фиксации, не пережил её.
+    """
+    bump(*resources)
+    transaction.on_commit(lambda: bump(*resources))
@@ -0,0 +1,93 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+from reviews.models import Category, Genre
+
+
+class LookupTable:
+    """Копия небольшой справочной таблицы в памяти процесса.
+
+    Таблица перечитывается из базы данных, когда меняется её версия.
+    Версия хранится в кеше Django и общая для всех процессов; локальные
+    изменения сбрасывают таблицу сразу, чужие замечаются не позже чем
+    через ``settings.LOOKUP_CACHE_CHECK_INTERVAL`` секунд. Если объекта
+    нет в копии, версия проверяется сразу же, но таблица перечитывается
+    только после её смены: несуществующий слаг не стоит запроса к базе.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.version_key = f'lookup:{model._meta.label_lower}:version'
+        self.version = None
+        self.checked_at = None
+        self.tables = None
+
+    def load(self):
+        # Таблица живёт в памяти процесса и не должна прийти с реплики.
+        objects = list(self.model.objects.using(DEFAULT_DB_ALIAS))
+        self.tables = (
+            objects,
+            {obj.slug: obj for obj in objects},
+            {obj.pk: obj for obj in objects},
+        )
+
+    def get_tables(self, check_version=False):
+        now = time.monotonic()
+        if (check_version or self.checked_at is None or now - self.checked_at
+                >= settings.LOOKUP_CACHE_CHECK_INTERVAL):
+            version = cache.get(self.version_key)
+            if version is None:
+                cache.add(self.version_key, 0, None)
+                version = cache.get(self.version_key)
+            if version != self.version:
+                self.tables = None
+                self.version = version
+            self.checked_at = now
+        if self.tables is None:
+            self.load()
+        return self.tables
+
+    def all(self):
+        return self.get_tables()[0]
+
+    def get_by_slug(self, slug):
+        obj = self.get_tables()[1].get(slug)
+        if obj is None:
+            # Объект мог появиться в другом процессе совсем недавно.
+            obj = self.get_tables(check_version=True)[1].get(slug)
+        return obj
+
+    def get_by_id(self, pk):
+        obj = self.get_tables()[2].get(pk)
+        if obj is None:
+            obj = self.get_tables(check_version=True)[2].get(pk)
+        return obj
+
+    def search(self, terms):
+        """Объекты, в названии которых есть все слова (без регистра)."""
+        terms = [term.casefold() for term in terms]
+        return [
+            obj for obj in self.all()
+            if all(term in obj.name.casefold() for term in terms)
+        ]
+
+    def invalidate(self):
+        """Сбрасывает таблицу во всех процессах."""
+        self.tables = None
+        self.checked_at = None
+        try:
+            cache.incr(self.version_key)
+        except ValueError:
+            cache.set(self.version_key, 1, None)
+
+
+categories = LookupTable(Category)
+genres = LookupTable(Genre)
+
+LOOKUP_TABLES = {
+    Category: categories,
+    Genre: genres,
+}
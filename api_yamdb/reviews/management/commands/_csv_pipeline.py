@@ -0,0 +1,85 @@
+"""Чтение csv-файлов для load_csv, в том числе в отдельных процессах.
+
+Модуль не импортирует Django, чтобы его можно было запускать в
+процессах пула без настройки проекта.
+"""
+import csv
+import gzip
+import os
+from itertools import islice
+from queue import Full
+
+# Файл -> файлы, на строки которых ссылаются его внешние ключи.
+DEPENDENCIES = {
+    'users.csv': (),
+    'category.csv': (),
+    'genre.csv': (),
+    'titles.csv': ('category.csv',),
+    'review.csv': ('titles.csv', 'users.csv'),
+    'comments.csv': ('review.csv', 'users.csv'),
+    'genre_title.csv': ('genre.csv', 'titles.csv'),
+}
+
+# Сколько разобранных пачек файла может ждать записи.
+QUEUE_BATCHES = 4
+
+
+def import_order(dependencies=DEPENDENCIES):
+    """Топологическая сортировка файлов: зависимости идут раньше."""
+    order, done = [], set()
+    pending = list(dependencies)
+    while pending:
+        ready = [
+            name for name in pending
+            if all(parent in done for parent in dependencies[name])
+        ]
+        if not ready:
+            raise ValueError(
+                'Циклическая зависимость между файлами: '
+                + ', '.join(pending)
+            )
+        for name in ready:
+            pending.remove(name)
+            done.add(name)
+            order.append(name)
+    return order
+
+
+def read_csv(directory, file_name):
+    """Построчно читает csv-файл или его сжатую версию ``*.csv.gz``."""
+    path = os.path.join(directory, file_name)
+    if not os.path.exists(path) and os.path.exists(path + '.gz'):
+        df = gzip.open(path + '.gz', 'rt', encoding='UTF-8', newline='')
+    else:
+        df = open(path, 'r', encoding='UTF-8', newline='')
+    with df:
+        yield from csv.DictReader(df)
+
+
+def parse_file(directory, file_name, batch_size, queue, stop):
+    """Разбирает файл в процессе пула и передаёт пачки строк писателю.
+
+    В конце в очередь кладётся ``None``, а при ошибке — исключение.
+    Если писатель остановился (``stop``), разбор прекращается.
+    """
+    def put(item):
+        while not stop.is_set():
+            try:
+                queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    try:
+        rows = read_csv(directory, file_name)
+        while not stop.is_set():
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            if not put(batch):
+                return
+    except Exception as error:
+        put(error)
+        return
+    put(None)
@@ -0,0 +1,94 @@
+"""Повторная загрузка csv: пропуск и обновление уже существующих строк."""
+import datetime as dt
+import hashlib
+
+from django.db import connection
+from django.utils import timezone
+
+# Не больше, чем допускает SQLite в одном запросе.
+MAX_QUERY_IDS = 900
+
+
+def supports_upsert():
+    """INSERT ... ON CONFLICT есть в Postgres и в SQLite начиная с 3.24."""
+    if connection.vendor == 'postgresql':
+        return True
+    return (connection.vendor == 'sqlite'
+            and connection.Database.sqlite_version_info >= (3, 24, 0))
+
+
+def normalize(field, value):
+    value = field.to_python(value)
+    if isinstance(value, dt.datetime):
+        if timezone.is_aware(value):
+            value = value.astimezone(dt.timezone.utc).replace(tzinfo=None)
+        return value.isoformat()
+    return value
+
+
+def row_hash(values):
+    return hashlib.blake2b(repr(values).encode(), digest_size=16).digest()
+
+
+def instance_hash(instance, fields):
+    return row_hash(tuple(
+        normalize(field, getattr(instance, field.attname)) for field in fields
+    ))
+
+
+def instance_pk(instance):
+    return instance._meta.pk.to_python(instance.pk)
+
+
+def stored_hash(fields, values):
+    return row_hash(tuple(
+        normalize(field, value) for field, value in zip(fields, values)
+    ))
+
+
+def existing_rows(model, pks, fields):
+    """Сохранённые значения полей строк с заданными ключами."""
+    pks = list(pks)
+    names = [model._meta.pk.attname] + [field.attname for field in fields]
+    stored = {}
+    for start in range(0, len(pks), MAX_QUERY_IDS):
+        rows = model.objects.filter(
+            pk__in=pks[start:start + MAX_QUERY_IDS]
+        ).order_by().values_list(*names)
+        for pk, *values in rows:
+            stored[pk] = tuple(values)
+    return stored
+
+
+def upsert(model, instances, fields):
+    """INSERT ... ON CONFLICT (pk) DO UPDATE для полей ``fields``."""
+    if not instances:
+        return
+    meta = model._meta
+    columns = meta.concrete_fields
+    quote = connection.ops.quote_name
+    assignments = ', '.join(
+        f'{quote(field.column)} = excluded.{quote(field.column)}'
+        for field in fields
+    )
+    conflict = (
+        f'DO UPDATE SET {assignments}' if assignments else 'DO NOTHING'
+    )
+    batch_size = connection.ops.bulk_batch_size(columns, instances)
+    with connection.cursor() as cursor:
+        for start in range(0, len(instances), batch_size):
+            batch = instances[start:start + batch_size]
+            row = '(' + ', '.join(['%s'] * len(columns)) + ')'
+            params = [
+                field.get_db_prep_save(
+                    field.pre_save(instance, add=True), connection
+                )
+                for instance in batch for field in columns
+            ]
+            cursor.execute(
+                f'INSERT INTO {quote(meta.db_table)} '
+                f'({", ".join(quote(field.column) for field in columns)}) '
+                f'VALUES {", ".join([row] * len(batch))} '
+                f'ON CONFLICT ({quote(meta.pk.column)}) {conflict}',
+                params
+            )
@@ -0,0 +1,133 @@
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+from django.db import OperationalError, connection, transaction
+
+from reviews.models import Comment, Review, Title, User
+
+
+class Command(BaseCommand):
+    help = (
+        'Измеряет пропускную способность чтения отзывов, пока другие '
+        'потоки пишут комментарии; профиль базы задаёт YAMDB_DB_PROFILE'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--readers',
+            type=int,
+            default=4,
+            help='Число читающих потоков'
+        )
+        parser.add_argument(
+            '--writers',
+            type=int,
+            default=2,
+            help='Число пишущих потоков'
+        )
+        parser.add_argument(
+            '--duration',
+            type=float,
+            default=10,
+            help='Длительность замера в секундах'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=20,
+            help='Размер читаемой страницы отзывов'
+        )
+
+    def read(self, title_ids, limit):
+        title_id = random.choice(title_ids)
+        list(Title.objects.filter(pk=title_id).values('name', 'rating'))
+        list(
+            Review.objects.filter(title_id=title_id).order_by(
+                '-pub_date', '-pk'
+            ).values('id', 'text', 'author__username', 'score', 'pub_date')[
+                :limit
+            ]
+        )
+
+    def write(self, review_ids, author):
+        with transaction.atomic():
+            comment = Comment.objects.create(
+                review_id=random.choice(review_ids),
+                author=author,
+                text='Комментарий нагрузочного теста'
+            )
+            comment.delete()
+
+    def worker(self, operation, deadline, stats):
+        done = errors = 0
+        try:
+            while time.monotonic() < deadline:
+                try:
+                    operation()
+                except OperationalError:
+                    errors += 1
+                else:
+                    done += 1
+        finally:
+            connection.close()
+        with self.lock:
+            stats['done'] += done
+            stats['errors'] += errors
+
+    def run(self, options, title_ids, review_ids, author):
+        self.lock = threading.Lock()
+        reads = {'done': 0, 'errors': 0}
+        writes = {'done': 0, 'errors': 0}
+        deadline = time.monotonic() + options['duration']
+        threads = [
+            threading.Thread(target=self.worker, args=(
+                lambda: self.read(title_ids, options['limit']),
+                deadline, reads
+            ))
+            for _ in range(options['readers'])
+        ] + [
+            threading.Thread(target=self.worker, args=(
+                lambda: self.write(review_ids, author), deadline, writes
+            ))
+            for _ in range(options['writers'])
+        ]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return reads, writes, time.monotonic() - started
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Замер рассчитан только на SQLite')
+        title_ids = list(
+            Title.objects.filter(reviews__isnull=False).distinct().values_list(
+                'pk', flat=True
+            )
+        )
+        review_ids = list(Review.objects.values_list('pk', flat=True))
+        author = User.objects.order_by('pk').first()
+        if not review_ids or author is None:
+            raise CommandError(
+                'В базе нет отзывов: загрузите данные командой load_csv'
+            )
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            journal_mode = cursor.fetchone()[0]
+        self.stdout.write(
+            f'Профиль {settings.DATABASE_PROFILE}, журнал {journal_mode}, '
+            f'читателей {options["readers"]}, '
+            f'писателей {options["writers"]}'
+        )
+        reads, writes, elapsed = self.run(
+            options, title_ids, review_ids, author
+        )
+        for name, stats in (('Чтение', reads), ('Запись', writes)):
+            self.stdout.write(
+                f'{name}: {stats["done"] / elapsed:.1f} оп/с, '
+                f'ошибок блокировки {stats["errors"]}'
+            )
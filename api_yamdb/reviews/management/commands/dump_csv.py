@@ -0,0 +1,49 @@
+import gzip
+import os
+
+from django.core.management import BaseCommand
+
+from reviews.export import CSV, FORMATTERS, TABLES, export_lines
+
+
+class Command(BaseCommand):
+    help = 'Выгружает базу данных в csv-файлы в формате load_csv'
+
+    def add_arguments(self, parser):
+        parser.add_argument('file_path', type=str)
+        parser.add_argument(
+            '--format',
+            choices=tuple(FORMATTERS),
+            default=CSV,
+            help='Формат файлов: csv для load_csv или ndjson'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Сколько строк читать из базы данных за один раз'
+        )
+        parser.add_argument(
+            '--gzip',
+            action='store_true',
+            help='Сжимать файлы (*.gz)'
+        )
+
+    def handle(self, *args, **options):
+        directory = options['file_path']
+        output_format = options['format']
+        os.makedirs(directory, exist_ok=True)
+        for file_name in TABLES:
+            name = os.path.splitext(file_name)[0] + '.' + output_format
+            path = os.path.join(directory, name)
+            if options['gzip']:
+                path += '.gz'
+                df = gzip.open(path, 'wt', encoding='UTF-8', newline='')
+            else:
+                df = open(path, 'w', encoding='UTF-8', newline='')
+            with df:
+                df.writelines(export_lines(
+                    file_name, output_format, options['chunk_size']
+                ))
+            self.stdout.write(f'{path}')
+        self.stdout.write(self.style.SUCCESS('Выгрузка данных завершена'))
@@ -1,7 +1,28 @@
-import csv
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from multiprocessing import Manager
 
-from django.core.management import BaseCommand
+from django.core.management import BaseCommand, CommandError
+from django.db import transaction
 
+from reviews.management.commands._csv_pipeline import (
+    QUEUE_BATCHES,
+    import_order,
+    parse_file,
+    read_csv
+)
+from reviews.management.commands._upsert import (
+    MAX_QUERY_IDS,
+    existing_rows,
+    instance_hash,
+    instance_pk,
+    stored_hash,
+    supports_upsert,
+    upsert
+)
+from reviews.generations import RESOURCES, bump
+from reviews.lookups import LOOKUP_TABLES
 from reviews.models import (
     Category,
     Comment,
@@ -9,8 +30,15 @@ from reviews.models import (
     GenreTitle,
     Review,
     Title,
-    User
+    User,
+    normalize_name
 )
+from reviews.ratings import rebuild_ratings
+from reviews.search import rebuild_index, rebuild_title_prefixes
+
+INSERT = 'insert'
+UPSERT = 'upsert'
+SKIP_EXISTING = 'skip-existing'
 
 
 class Command(BaseCommand):
@@ -18,122 +46,309 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument('file_path', type=str)
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Сколько строк сохранять одним INSERT'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Сколько процессов разбирают csv-файлы параллельно'
+        )
+        parser.add_argument(
+            '--mode',
+            choices=(INSERT, UPSERT, SKIP_EXISTING),
+            default=INSERT,
+            help=(
+                f'{INSERT} - только новые строки, {UPSERT} - добавить новые '
+                f'и обновить изменённые, {SKIP_EXISTING} - пропустить '
+                'строки с уже существующими id'
+            )
+        )
 
-    def import_users(self, directory):
-        with open(directory + 'users.csv', 'r', encoding='UTF-8') as df:
-            temp_data = []
-            reader = csv.DictReader(df)
-            for row in reader:
-                temp_data.append(
-                    User(
-                        id=row['id'],
-                        username=row['username'],
-                        email=row['email'],
-                        first_name=row['first_name'],
-                        last_name=row['last_name'],
-                        bio=row['bio'],
-                        role=row['role'],
-                    )
+    def read_rows(self, directory, file_name):
+        """Строки файла: из очереди процесса-разборщика или напрямую."""
+        if file_name not in self.queues:
+            yield from read_csv(directory, file_name)
+            return
+        queue = self.queues[file_name]
+        while True:
+            batch = queue.get()
+            if batch is None:
+                return
+            if isinstance(batch, Exception):
+                raise CommandError(f'{file_name}: {batch}')
+            yield from batch
+
+    def check_references(self, batch, references, file_name):
+        """Проверяет внешние ключи пачки одним запросом на таблицу."""
+        for attname, model in references:
+            try:
+                ids = {
+                    int(getattr(instance, attname)) for instance in batch
+                    if getattr(instance, attname) not in ('', None)
+                }
+            except ValueError as error:
+                raise CommandError(f'{file_name}: {error}')
+            ids = list(ids)
+            found = set()
+            for start in range(0, len(ids), MAX_QUERY_IDS):
+                found.update(model.objects.filter(
+                    pk__in=ids[start:start + MAX_QUERY_IDS]
+                ).values_list('pk', flat=True))
+            missing = sorted(set(ids) - found)
+            if missing:
+                raise CommandError(
+                    f'{file_name}: не найдены объекты '
+                    f'"{model._meta.verbose_name}" с id='
+                    + ', '.join(map(str, missing[:10]))
                 )
-            User.objects.bulk_create(temp_data)
+
+    def save(self, model, instances, file_name, fields, references=(),
+             track=None):
+        """Сохраняет поток объектов пачками в одной транзакции.
+
+        В памяти одновременно находится не больше одной пачки.
+        ``fields`` - поля, которые заполняются из csv-файла. Возвращает
+        значения поля ``track`` (по умолчанию первичного ключа) у
+        записанных строк до и после записи.
+        """
+        fields = [model._meta.get_field(name) for name in fields]
+        track = model._meta.get_field(track) if track else model._meta.pk
+        instances = iter(instances)
+        total = written = 0
+        tracked = set()
+        started = time.monotonic()
+        with transaction.atomic():
+            while True:
+                batch = list(islice(instances, self.batch_size))
+                if not batch:
+                    break
+                self.check_references(batch, references, file_name)
+                count, values = self.write_batch(model, batch, fields, track)
+                written += count
+                tracked.update(values)
+                total += len(batch)
+                if self.verbosity > 1:
+                    self.report(file_name, total, written, started)
+        self.report(file_name, total, written, started)
+        return tracked
+
+    def write_batch(self, model, batch, fields, track):
+        """Записывает пачку с учётом режима.
+
+        Возвращает число записанных строк и значения поля ``track`` у них
+        до и после записи. В режимах повторной загрузки строки
+        сравниваются с сохранёнными по хешу содержимого, и неизменённые
+        строки не перезаписываются.
+        """
+        if self.mode == INSERT:
+            model.objects.bulk_create(batch)
+            return len(batch), {
+                track.to_python(getattr(instance, track.attname))
+                for instance in batch
+            }
+        by_pk = {instance_pk(instance): instance for instance in batch}
+        stored = existing_rows(model, by_pk, fields)
+        new = [
+            instance for pk, instance in by_pk.items() if pk not in stored
+        ]
+        changed = []
+        if self.mode == SKIP_EXISTING:
+            model.objects.bulk_create(new)
+        else:
+            changed = [
+                instance for pk, instance in by_pk.items()
+                if pk in stored and stored_hash(fields, stored[pk])
+                != instance_hash(instance, fields)
+            ]
+            upsert(model, new + changed, fields)
+        values = {
+            track.to_python(getattr(instance, track.attname))
+            for instance in new + changed
+        }
+        if track in fields:
+            position = fields.index(track)
+            values.update(
+                stored[instance_pk(instance)][position]
+                for instance in changed
+            )
+        return len(new) + len(changed), values
+
+    def report(self, file_name, total, written, started):
+        elapsed = time.monotonic() - started
+        rate = total / elapsed if elapsed else total
+        self.stdout.write(
+            f'{file_name}: {total} строк, записано {written}, '
+            f'{rate:.0f} строк/с'
+        )
+
+    def import_users(self, directory):
+        self.save(User, (
+            User(
+                id=row['id'],
+                username=row['username'],
+                email=row['email'],
+                first_name=row['first_name'],
+                last_name=row['last_name'],
+                bio=row['bio'],
+                role=row['role'],
+            )
+            for row in self.read_rows(directory, 'users.csv')
+        ), 'users.csv', (
+            'username', 'email', 'first_name', 'last_name', 'bio', 'role'
+        ))
 
     def import_categories(self, directory):
-        with open(directory + 'category.csv', 'r', encoding='UTF-8') as df:
-            temp_data = []
-            reader = csv.DictReader(df)
-            for row in reader:
-                temp_data.append(
-                    Category(
-                        id=row['id'],
-                        name=row['name'],
-                        slug=row['slug']
-                    )
-                )
-            Category.objects.bulk_create(temp_data)
+        self.save(Category, (
+            Category(
+                id=row['id'],
+                name=row['name'],
+                slug=row['slug']
+            )
+            for row in self.read_rows(directory, 'category.csv')
+        ), 'category.csv', ('name', 'slug'))
 
     def import_genres(self, directory):
-        with open(directory + 'genre.csv', 'r', encoding='UTF-8') as df:
-            temp_data = []
-            reader = csv.DictReader(df)
-            for row in reader:
-                temp_data.append(
-                    Genre(
-                        id=row['id'],
-                        name=row['name'],
-                        slug=row['slug']
-                    )
-                )
-            Genre.objects.bulk_create(temp_data)
+        self.save(Genre, (
+            Genre(
+                id=row['id'],
+                name=row['name'],
+                slug=row['slug']
+            )
+            for row in self.read_rows(directory, 'genre.csv')
+        ), 'genre.csv', ('name', 'slug'))
 
     def import_titles(self, directory):
-        with open(directory + 'titles.csv', 'r', encoding='UTF-8') as df:
-            temp_data = []
-            reader = csv.DictReader(df)
-            for row in reader:
-                temp_data.append(
-                    Title(
-                        id=row['id'],
-                        name=row['name'],
-                        year=row['year'],
-                        category=Category.objects.get(id=row['category'])
-                    )
-                )
-            Title.objects.bulk_create(temp_data)
+        rebuild_all = self.mode == INSERT and not Title.objects.exists()
+        title_ids = list(self.save(Title, (
+            Title(
+                id=row['id'],
+                name=row['name'],
+                name_normalized=normalize_name(row['name']),
+                year=row['year'],
+                category_id=row['category'] or None
+            )
+            for row in self.read_rows(directory, 'titles.csv')
+        ), 'titles.csv', ('name', 'name_normalized', 'year', 'category'), (
+            ('category_id', Category),
+        )))
+        if rebuild_all:
+            rebuild_title_prefixes()
+        else:
+            for start in range(0, len(title_ids), MAX_QUERY_IDS):
+                rebuild_title_prefixes(title_ids[start:start + MAX_QUERY_IDS])
 
     def import_reviews(self, directory):
-        with open(directory + 'review.csv', 'r', encoding='UTF-8') as df:
-            temp_data = []
-            reader = csv.DictReader(df)
-            for row in reader:
-                temp_data.append(
-                    Review(
-                        id=row['id'],
-                        title=Title.objects.get(id=row['title_id']),
-                        text=row['text'],
-                        score=row['score'],
-                        author=User.objects.get(id=row['author']),
-                        pub_date=row['pub_date']
-                    )
-                )
-            Review.objects.bulk_create(temp_data)
+        # Загрузка в пустую таблицу пересчитывает рейтинг всех
+        # произведений, повторная - только тех, чьи отзывы записаны.
+        rebuild_all = self.mode == INSERT and not Review.objects.exists()
+        title_ids = list(self.save(Review, (
+            Review(
+                id=row['id'],
+                title_id=row['title_id'],
+                text=row['text'],
+                score=row['score'],
+                author_id=row['author'],
+                pub_date=row['pub_date']
+            )
+            for row in self.read_rows(directory, 'review.csv')
+        ), 'review.csv', ('title', 'text', 'score', 'author'), (
+            ('title_id', Title), ('author_id', User)
+        ), track='title'))
+        if rebuild_all:
+            rebuild_ratings()
+        else:
+            for start in range(0, len(title_ids), MAX_QUERY_IDS):
+                rebuild_ratings(title_ids[start:start + MAX_QUERY_IDS])
+        rebuild_index(Review)
 
     def import_comments(self, directory):
-        with open(directory + 'comments.csv', 'r', encoding='UTF-8') as df:
-            temp_data = []
-            reader = csv.DictReader(df)
-            for row in reader:
-                temp_data.append(
-                    Comment(
-                        id=row['id'],
-                        text=row['text'],
-                        author=User.objects.get(id=row['author']),
-                        review=Review.objects.get(id=row['review_id']),
-                        pub_date=row['pub_date']
-                    )
-                )
-            Comment.objects.bulk_create(temp_data)
+        self.save(Comment, (
+            Comment(
+                id=row['id'],
+                text=row['text'],
+                author_id=row['author'],
+                review_id=row['review_id'],
+                pub_date=row['pub_date']
+            )
+            for row in self.read_rows(directory, 'comments.csv')
+        ), 'comments.csv', ('text', 'author', 'review'), (
+            ('author_id', User), ('review_id', Review)
+        ))
+        rebuild_index(Comment)
 
     def import_genres_titles(self, directory):
-        with open(directory + 'genre_title.csv', 'r', encoding='UTF-8') as df:
-            temp_data = []
-            reader = csv.DictReader(df)
-            for row in reader:
-                temp_data.append(
-                    GenreTitle(
-                        id=row['id'],
-                        genre=Genre.objects.get(id=row['genre_id']),
-                        title=Title.objects.get(id=row['title_id'])
-                    )
+        self.save(GenreTitle, (
+            GenreTitle(
+                id=row['id'],
+                genre_id=row['genre_id'],
+                title_id=row['title_id']
+            )
+            for row in self.read_rows(directory, 'genre_title.csv')
+        ), 'genre_title.csv', ('genre', 'title'), (
+            ('genre_id', Genre), ('title_id', Title)
+        ))
+
+    def import_parallel(self, directory, importers, workers):
+        """Разбирает файлы в пуле процессов, записывает в одном потоке.
+
+        Файлы отправляются в пул в порядке зависимостей, поэтому файл,
+        который сейчас записывается, всегда уже разбирается.
+        """
+        order = import_order()
+        with Manager() as manager, ProcessPoolExecutor(workers) as pool:
+            stop = manager.Event()
+            self.queues = {
+                name: manager.Queue(QUEUE_BATCHES) for name in order
+            }
+            futures = [
+                pool.submit(
+                    parse_file, directory, name, self.batch_size,
+                    self.queues[name], stop
                 )
-            GenreTitle.objects.bulk_create(temp_data)
+                for name in order
+            ]
+            try:
+                for name in order:
+                    importers[name](directory)
+            finally:
+                stop.set()
+            for future in futures:
+                future.result()
 
     def handle(self, *args, **options):
         directory = options['file_path']
-        self.import_users(directory)
-        self.import_categories(directory)
-        self.import_genres(directory)
-        self.import_titles(directory)
-        self.import_reviews(directory)
-        self.import_comments(directory)
-        self.import_genres_titles(directory)
+        self.batch_size = options['batch_size']
+        self.verbosity = options['verbosity']
+        self.mode = options['mode']
+        self.queues = {}
+        if self.mode == UPSERT and not supports_upsert():
+            raise CommandError(
+                f'Режим {UPSERT} требует SQLite 3.24+ или PostgreSQL'
+            )
+        if self.batch_size < 1:
+            raise CommandError('--batch-size должен быть положительным')
+        if options['workers'] < 1:
+            raise CommandError('--workers должен быть положительным')
+        importers = {
+            'users.csv': self.import_users,
+            'category.csv': self.import_categories,
+            'genre.csv': self.import_genres,
+            'titles.csv': self.import_titles,
+            'review.csv': self.import_reviews,
+            'comments.csv': self.import_comments,
+            'genre_title.csv': self.import_genres_titles,
+        }
+        if options['workers'] > 1:
+            self.import_parallel(directory, importers, options['workers'])
+        else:
+            for name in import_order():
+                importers[name](directory)
+        for table in LOOKUP_TABLES.values():
+            table.invalidate()
+        bump(*RESOURCES)
         self.stdout.write(self.style.SUCCESS('Импорт данных завершен'))
@@ -0,0 +1,34 @@
+from django.core.management import BaseCommand, CommandError
+from django.db import transaction
+
+from reviews.generations import TITLES, bump
+from reviews.ratings import inconsistent_ratings, rebuild_ratings
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает и проверяет сохранённые рейтинги произведений'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только проверить рейтинги, не изменяя базу данных'
+        )
+
+    def handle(self, *args, **options):
+        stale = list(inconsistent_ratings().values_list('pk', flat=True))
+        if options['check']:
+            if stale:
+                raise CommandError(
+                    'Рейтинг не совпадает с отзывами у произведений: '
+                    + ', '.join(map(str, stale))
+                )
+            self.stdout.write(self.style.SUCCESS('Рейтинги согласованы'))
+            return
+        with transaction.atomic():
+            updated = rebuild_ratings()
+        bump(TITLES)
+        self.stdout.write(self.style.SUCCESS(
+            f'Рейтинг пересчитан для {updated} произведений, '
+            f'исправлено расхождений: {len(stale)}'
+        ))
@@ -0,0 +1,47 @@
+import time
+
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from reviews.outbox import claim_batch, deliver
+
+
+class Command(BaseCommand):
+    help = (
+        'Отправляет письма из таблицы исходящих пачками через одно '
+        'соединение с почтовым сервером'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.EMAIL_OUTBOX['BATCH_SIZE'],
+            help='Сколько писем отправлять за одно соединение'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0,
+            help=(
+                'Работать постоянно, проверяя очередь каждые N секунд '
+                '(0 - отправить накопившееся и выйти)'
+            )
+        )
+
+    def send_pending(self, batch_size):
+        sent = 0
+        while True:
+            emails = claim_batch(batch_size)
+            if not emails:
+                return sent
+            sent += deliver(emails)
+
+    def handle(self, *args, **options):
+        while True:
+            sent = self.send_pending(options['batch_size'])
+            if sent:
+                self.stdout.write(f'Отправлено писем: {sent}')
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
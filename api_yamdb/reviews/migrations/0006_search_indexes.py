@@ -0,0 +1,28 @@
+from django.db import migrations
+
+from reviews.search import (
+    create_search_indexes,
+    drop_search_indexes,
+    rebuild_index
+)
+
+
+def create_indexes(apps, schema_editor):
+    create_search_indexes(schema_editor)
+    for name in ('Review', 'Comment'):
+        rebuild_index(apps.get_model('reviews', name))
+
+
+def drop_indexes(apps, schema_editor):
+    drop_search_indexes(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_title_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
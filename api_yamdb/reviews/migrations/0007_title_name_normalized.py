@@ -0,0 +1,36 @@
+# Generated by Django 2.2.16 on 2026-10-18 17:37
+
+from django.db import migrations, models
+
+
+def normalize_name(name):
+    # Копия reviews.models.normalize_name на момент миграции.
+    return ' '.join(name.casefold().replace('ё', 'е').split())[:256]
+
+
+def fill_name_normalized(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    titles = list(Title.objects.only('name'))
+    for title in titles:
+        title.name_normalized = normalize_name(title.name)
+    Title.objects.bulk_update(titles, ('name_normalized',), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='name_normalized',
+            field=models.CharField(default='', editable=False, max_length=256, verbose_name='Название для поиска'),
+        ),
+        migrations.RunPython(fill_name_normalized, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['name_normalized', 'rating'], name='title_name_prefix_idx'),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 2.2.16 on 2026-10-18 18:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_title_prefixes(apps, schema_editor):
+    # Копия reviews.search.rebuild_title_prefixes на момент миграции.
+    Title = apps.get_model('reviews', 'Title')
+    TitlePrefix = apps.get_model('reviews', 'TitlePrefix')
+    rows = Title.objects.order_by().values_list(
+        'pk', 'name_normalized', 'rating'
+    ).iterator(chunk_size=2000)
+    batch = []
+    for pk, name_normalized, rating in rows:
+        batch.extend(
+            TitlePrefix(title_id=pk, prefix=name_normalized[:end],
+                        rating=rating or 0)
+            for end in range(1, min(len(name_normalized), 20) + 1)
+        )
+        if len(batch) >= 2000:
+            TitlePrefix.objects.bulk_create(batch)
+            batch = []
+    TitlePrefix.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0009_outbox_email'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitlePrefix',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prefix', models.CharField(max_length=20, verbose_name='Префикс названия')),
+                ('rating', models.FloatField(default=0, verbose_name='Рейтинг, 0 - без оценок')),
+            ],
+            options={
+                'verbose_name': 'Префикс названия',
+                'verbose_name_plural': 'Префиксы названий',
+                'default_related_name': 'prefixes',
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name='title',
+            name='title_name_prefix_idx',
+        ),
+        migrations.AddField(
+            model_name='titleprefix',
+            name='title',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='prefixes', to='reviews.Title', verbose_name='Произведение'),
+        ),
+        migrations.AddIndex(
+            model_name='titleprefix',
+            index=models.Index(fields=['prefix', '-rating', 'title'], name='title_prefix_rating_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='titleprefix',
+            constraint=models.UniqueConstraint(fields=('title', 'prefix'), name='unique_title_prefix'),
+        ),
+        migrations.RunPython(fill_title_prefixes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 2.2.16 on 2026-10-18 18:34
+
+from django.conf import settings
+from django.db import migrations, models
+import reviews.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_title_prefix'),
+    ]
+
+    # on_delete обрабатывается в Python, схема базы не меняется.
+    operations = [
+        migrations.SeparateDatabaseAndState(state_operations=[
+            migrations.AlterField(
+                model_name='review',
+                name='author',
+                field=models.ForeignKey(help_text='Выберите автора', on_delete=reviews.models.cascade_reviews, related_name='reviews', to=settings.AUTH_USER_MODEL, verbose_name='Автор'),
+            ),
+            migrations.AlterField(
+                model_name='review',
+                name='title',
+                field=models.ForeignKey(help_text='Выберите произведение', on_delete=reviews.models.cascade_reviews, related_name='reviews', to='reviews.Title', verbose_name='Произведение'),
+            ),
+        ]),
+    ]
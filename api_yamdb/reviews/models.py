@@ -2,10 +2,18 @@ from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.utils import timezone
 
 from reviews.validators import validate_username, validate_year
 
 
+def normalize_name(name):
+    """Название без регистра, «ё» и лишних пробелов для поиска по префиксу."""
+    return ' '.join(
+        name.casefold().replace('ё', 'е').split()
+    )[:settings.LENGTH_NAME_NORMALIZED_FIELD]
+
+
 class User(AbstractUser):
     USER = 'user'
     MODERATOR = 'moderator'
@@ -52,6 +60,12 @@ class User(AbstractUser):
         blank=True
     )
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_username = instance.__dict__.get('username')
+        return instance
+
     @property
     def is_admin(self):
         return self.role == self.ADMIN or self.is_staff
@@ -92,6 +106,12 @@ class Genre(BaseNameSlug):
 
 class Title(models.Model):
     name = models.TextField()
+    name_normalized = models.CharField(
+        max_length=settings.LENGTH_NAME_NORMALIZED_FIELD,
+        default='',
+        editable=False,
+        verbose_name='Название для поиска'
+    )
     year = models.IntegerField(validators=(validate_year,))
     description = models.TextField(null=True)
     genre = models.ManyToManyField(
@@ -104,16 +124,114 @@ class Title(models.Model):
         blank=True,
         null=True
     )
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Сумма оценок'
+    )
+    review_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество отзывов'
+    )
+    rating = models.FloatField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Рейтинг'
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения'
+    )
 
     class Meta:
         ordering = ('name',)
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
         default_related_name = '%(class)ss'
+        indexes = (
+            models.Index(fields=('rating',), name='title_rating_idx'),
+            models.Index(fields=('year',), name='title_year_idx'),
+            models.Index(fields=('name',), name='title_name_idx'),
+            models.Index(
+                fields=('review_count',), name='title_review_count_idx'
+            ),
+            models.Index(
+                fields=('category', 'rating'), name='title_cat_rating_idx'
+            ),
+            models.Index(
+                fields=('category', 'year'), name='title_cat_year_idx'
+            ),
+            models.Index(
+                fields=('category', 'name'), name='title_cat_name_idx'
+            ),
+            models.Index(
+                fields=('category', 'review_count'),
+                name='title_cat_count_idx'
+            ),
+            models.Index(
+                fields=('year', 'rating'), name='title_year_rating_idx'
+            ),
+            models.Index(
+                fields=('year', 'name'), name='title_year_name_idx'
+            ),
+            models.Index(
+                fields=('year', 'review_count'),
+                name='title_year_count_idx'
+            ),
+        )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_name_normalized = instance.__dict__.get(
+            'name_normalized'
+        )
+        return instance
 
     def __str__(self):
         return f'{self.name[:15]} - {self.genre[:15]} - {self.year}'
 
+    def save(self, *args, **kwargs):
+        self.name_normalized = normalize_name(self.name)
+        super().save(*args, **kwargs)
+
+
+class TitlePrefix(models.Model):
+    """Начало нормализованного названия с копией рейтинга для подсказок."""
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        db_index=False,
+        verbose_name='Произведение'
+    )
+    prefix = models.CharField(
+        max_length=settings.TITLE_SUGGEST_PREFIX_LENGTH,
+        verbose_name='Префикс названия'
+    )
+    rating = models.FloatField(
+        default=0,
+        verbose_name='Рейтинг, 0 - без оценок'
+    )
+
+    class Meta:
+        default_related_name = 'prefixes'
+        verbose_name = 'Префикс названия'
+        verbose_name_plural = 'Префиксы названий'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('title', 'prefix'),
+                name='unique_title_prefix'
+            ),
+        )
+        indexes = (
+            models.Index(
+                fields=('prefix', '-rating', 'title'),
+                name='title_prefix_rating_idx'
+            ),
+        )
+
 
 class GenreTitle(models.Model):
     genre = models.ForeignKey(
@@ -131,6 +249,11 @@ class GenreTitle(models.Model):
         default_related_name = '%(class)ss'
         verbose_name = 'Жанр - Произведение'
         verbose_name_plural = 'Жанры - Произведения'
+        indexes = (
+            models.Index(
+                fields=('genre', 'title'), name='genre_title_genre_idx'
+            ),
+        )
 
 
 class BaseTextAuthorDate(models.Model):
@@ -158,7 +281,28 @@ class BaseTextAuthorDate(models.Model):
                 f'"{self.text[:15]}"')
 
 
+def cascade_reviews(collector, field, sub_objs, using):
+    """CASCADE, который отмечает отзывы, удаляемые вместе с ``field``.
+
+    Все отзывы пачки делят одну отметку с произведениями, рейтинг
+    которых нужно пересчитать после их удаления.
+    """
+    models.CASCADE(collector, field, sub_objs, using)
+    cascade = {
+        'field': field.name,
+        'title_ids': {review.title_id for review in sub_objs},
+    }
+    for review in sub_objs:
+        review._cascade = cascade
+
+
 class Review(BaseTextAuthorDate):
+    author = models.ForeignKey(
+        User,
+        on_delete=cascade_reviews,
+        verbose_name='Автор',
+        help_text='Выберите автора'
+    )
     score = models.PositiveSmallIntegerField(
         default=0,
         validators=(MaxValueValidator(10), MinValueValidator(1)),
@@ -167,11 +311,25 @@ class Review(BaseTextAuthorDate):
     )
     title = models.ForeignKey(
         Title,
-        on_delete=models.CASCADE,
+        on_delete=cascade_reviews,
         verbose_name='Произведение',
         help_text='Выберите произведение'
     )
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_rating_state()
+        return instance
+
+    def remember_rating_state(self):
+        """Запоминает оценку и произведение, учтённые в рейтинге."""
+        self._rating_state = (
+            (self.__dict__.get('title_id'), self.__dict__.get('score'))
+            if 'title_id' in self.__dict__ and 'score' in self.__dict__
+            else None
+        )
+
     class Meta(BaseTextAuthorDate.Meta):
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
@@ -181,6 +339,11 @@ class Review(BaseTextAuthorDate):
                 name='unique_review'
             ),
         )
+        indexes = (
+            models.Index(
+                fields=('title', 'pub_date'), name='review_title_date_idx'
+            ),
+        )
 
 
 class Comment(BaseTextAuthorDate):
@@ -194,3 +357,60 @@ class Comment(BaseTextAuthorDate):
     class Meta(BaseTextAuthorDate.Meta):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = (
+            models.Index(
+                fields=('review', 'pub_date'),
+                name='comment_review_date_idx'
+            ),
+        )
+
+
+class OutboxEmail(models.Model):
+    """Письмо, ожидающее отправки командой send_outbox."""
+    subject = models.CharField(
+        max_length=255,
+        verbose_name='Тема'
+    )
+    body = models.TextField(verbose_name='Текст')
+    from_email = models.EmailField(
+        max_length=settings.LENGTH_EMAIL_FIELD,
+        verbose_name='Отправитель'
+    )
+    recipient = models.EmailField(
+        max_length=settings.LENGTH_EMAIL_FIELD,
+        verbose_name='Получатель'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата создания'
+    )
+    send_after = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Отправить не раньше'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Неудачных попыток'
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name='Последняя ошибка'
+    )
+    sent_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Дата отправки'
+    )
+
+    class Meta:
+        ordering = ('send_after', 'pk')
+        verbose_name = 'Письмо'
+        verbose_name_plural = 'Исходящие письма'
+        indexes = (
+            models.Index(
+                fields=('sent_at', 'send_after'), name='outbox_due_idx'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
@@ -0,0 +1,94 @@
+"""Исходящие письма: запись в таблицу и доставка пачками.
+
+Письмо сохраняется в той же транзакции, что и данные, о которых оно
+сообщает, а отправляет его команда send_outbox. Неудачные попытки
+повторяются с экспоненциально растущей паузой.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.utils import timezone
+
+from reviews.models import OutboxEmail
+
+
+def queue_email(subject, body, from_email, recipient):
+    return OutboxEmail.objects.create(
+        subject=subject,
+        body=body,
+        from_email=from_email,
+        recipient=recipient
+    )
+
+
+def backoff(attempts):
+    """Пауза перед следующей попыткой после ``attempts`` неудачных."""
+    options = settings.EMAIL_OUTBOX
+    return timedelta(seconds=min(
+        options['BACKOFF'] * 2 ** (attempts - 1), options['MAX_BACKOFF']
+    ))
+
+
+def claim_batch(size):
+    """Забирает до ``size`` писем, которым пора уйти.
+
+    Взятые письма откладываются на ``EMAIL_OUTBOX['LEASE']`` секунд,
+    чтобы их не отправил другой обработчик; если обработчик упадёт,
+    письма вернутся в очередь по истечении этого срока.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        emails = OutboxEmail.objects.filter(
+            sent_at=None,
+            send_after__lte=now,
+            attempts__lt=settings.EMAIL_OUTBOX['MAX_ATTEMPTS']
+        )
+        if connection.features.has_select_for_update_skip_locked:
+            emails = emails.select_for_update(skip_locked=True)
+        emails = list(emails[:size])
+        lease = timedelta(seconds=settings.EMAIL_OUTBOX['LEASE'])
+        OutboxEmail.objects.filter(
+            pk__in=[email.pk for email in emails]
+        ).update(send_after=now + lease)
+    return emails
+
+
+def mark_failed(emails, error):
+    now = timezone.now()
+    for email in emails:
+        email.attempts += 1
+        email.last_error = str(error) or error.__class__.__name__
+        email.send_after = now + backoff(email.attempts)
+        email.save(update_fields=('attempts', 'last_error', 'send_after'))
+
+
+def deliver(emails):
+    """Отправляет письма через одно соединение с почтовым сервером.
+
+    Возвращает число отправленных писем.
+    """
+    mail_connection = get_connection(fail_silently=False)
+    try:
+        mail_connection.open()
+    except Exception as error:
+        mark_failed(emails, error)
+        return 0
+    sent = []
+    try:
+        for email in emails:
+            message = EmailMessage(
+                email.subject, email.body, email.from_email,
+                [email.recipient], connection=mail_connection
+            )
+            try:
+                message.send()
+            except Exception as error:
+                mark_failed([email], error)
+            else:
+                sent.append(email.pk)
+    finally:
+        mail_connection.close()
+    OutboxEmail.objects.filter(pk__in=sent).update(sent_at=timezone.now())
+    return len(sent)
@@ -0,0 +1,93 @@
+from django.db.models import (
+    Avg,
+    Case,
+    Count,
+    F,
+    FloatField,
+    IntegerField,
+    OuterRef,
+    Subquery,
+    Sum,
+    Value,
+    When
+)
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
+
+from reviews.models import Review, Title
+from reviews.search import update_prefix_ratings
+
+
+def apply_review_delta(title_id, score_delta, count_delta):
+    """Атомарно сдвигает сумму оценок и число отзывов произведения.
+
+    Рейтинг пересчитывается в том же UPDATE, поэтому конкурирующие
+    запросы не могут записать устаревшее значение. Дата изменения
+    произведения обновляется при любом изменении его отзывов.
+    """
+    if title_id is None:
+        return
+    new_sum = F('rating_sum') + score_delta
+    new_count = F('review_count') + count_delta
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=new_sum,
+        review_count=new_count,
+        rating=Case(
+            When(review_count=-count_delta, then=Value(None)),
+            default=Cast(new_sum, FloatField()) / new_count,
+            output_field=FloatField()
+        ),
+        updated_at=timezone.now()
+    )
+    update_prefix_ratings([title_id])
+
+
+def title_review_stats():
+    """Подзапросы с фактическими суммой, числом отзывов и средней оценкой."""
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    return {
+        'actual_sum': Coalesce(
+            Subquery(
+                reviews.annotate(total=Sum('score')).values('total'),
+                output_field=IntegerField()
+            ),
+            0
+        ),
+        'actual_count': Coalesce(
+            Subquery(
+                reviews.annotate(total=Count('pk')).values('total'),
+                output_field=IntegerField()
+            ),
+            0
+        ),
+        'actual_rating': Subquery(
+            reviews.annotate(total=Avg('score')).values('total'),
+            output_field=FloatField()
+        ),
+    }
+
+
+def rebuild_ratings(title_ids=None):
+    """Пересчитывает рейтинг по таблице отзывов и копирует его в префиксы."""
+    titles = Title.objects.all()
+    if title_ids is not None:
+        titles = titles.filter(pk__in=title_ids)
+    stats = title_review_stats()
+    updated = titles.update(
+        rating_sum=stats['actual_sum'],
+        review_count=stats['actual_count'],
+        rating=stats['actual_rating'],
+        updated_at=timezone.now()
+    )
+    update_prefix_ratings(title_ids)
+    return updated
+
+
+def inconsistent_ratings():
+    """Возвращает произведения, у которых сохранённый рейтинг устарел."""
+    return Title.objects.annotate(**title_review_stats()).exclude(
+        rating_sum=F('actual_sum'),
+        review_count=F('actual_count')
+    ).order_by('pk')
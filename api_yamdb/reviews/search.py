@@ -0,0 +1,230 @@
+"""Полнотекстовый поиск по отзывам и комментариям, подсказки названий.
+
+В SQLite текст хранится в виртуальной таблице FTS5 в виде основ слов,
+поэтому русская морфология учитывается без внешних токенизаторов;
+таблица обновляется сигналами. В Postgres используется GIN-индекс по
+``to_tsvector('russian', text)``, который база поддерживает сама.
+"""
+from django.conf import settings
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector
+)
+from django.db import connection, transaction
+from django.db.models import FloatField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from reviews.models import Title, TitlePrefix, normalize_name
+from reviews.stemmer import stems
+
+CONFIG = 'russian'
+# Больше любого символа: верхняя граница диапазона строк с префиксом.
+PREFIX_END = '\U0010ffff'
+SEARCH_TABLES = ('reviews_review', 'reviews_comment')
+
+
+def index_table(table):
+    return f'{table}_fts'
+
+
+def index_name(table):
+    return f'{table}_text_search_idx'
+
+
+def index_text(text):
+    return ' '.join(stems(text))
+
+
+def match_expression(query):
+    """Запрос FTS5: все основы слов, каждая как префикс."""
+    return ' '.join(f'"{word}"*' for word in stems(query))
+
+
+def create_search_indexes(schema_editor):
+    quote = schema_editor.quote_name
+    for table in SEARCH_TABLES:
+        if schema_editor.connection.vendor == 'postgresql':
+            schema_editor.execute(
+                f'CREATE INDEX {quote(index_name(table))} ON {quote(table)} '
+                f"USING gin (to_tsvector('{CONFIG}'::regconfig, "
+                f"COALESCE({quote('text')}, '')))"
+            )
+        elif schema_editor.connection.vendor == 'sqlite':
+            schema_editor.execute(
+                f'CREATE VIRTUAL TABLE {quote(index_table(table))} USING '
+                "fts5(text, tokenize='unicode61 remove_diacritics 0')"
+            )
+
+
+def drop_search_indexes(schema_editor):
+    quote = schema_editor.quote_name
+    for table in SEARCH_TABLES:
+        if schema_editor.connection.vendor == 'postgresql':
+            schema_editor.execute(
+                f'DROP INDEX IF EXISTS {quote(index_name(table))}'
+            )
+        elif schema_editor.connection.vendor == 'sqlite':
+            schema_editor.execute(
+                f'DROP TABLE IF EXISTS {quote(index_table(table))}'
+            )
+
+
+def uses_index_table():
+    return connection.vendor == 'sqlite'
+
+
+def update_index(instance):
+    """Переиндексирует текст отзыва или комментария (только SQLite)."""
+    if not uses_index_table():
+        return
+    table = connection.ops.quote_name(index_table(instance._meta.db_table))
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {table} WHERE rowid = %s', [instance.pk])
+        cursor.execute(
+            f'INSERT INTO {table} (rowid, text) VALUES (%s, %s)',
+            [instance.pk, index_text(instance.text)]
+        )
+
+
+def remove_from_index(instance):
+    if not uses_index_table():
+        return
+    table = connection.ops.quote_name(index_table(instance._meta.db_table))
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {table} WHERE rowid = %s', [instance.pk])
+
+
+def rebuild_index(model, chunk_size=2000):
+    """Заново строит индекс модели по таблице; возвращает число строк."""
+    if not uses_index_table():
+        return model.objects.count()
+    table = connection.ops.quote_name(index_table(model._meta.db_table))
+    rows = model.objects.order_by().values_list('pk', 'text').iterator(
+        chunk_size=chunk_size
+    )
+    insert = f'INSERT INTO {table} (rowid, text) VALUES (%s, %s)'
+    count = 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {table}')
+        batch = []
+        for pk, text in rows:
+            batch.append((pk, index_text(text)))
+            if len(batch) == chunk_size:
+                cursor.executemany(insert, batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            cursor.executemany(insert, batch)
+            count += len(batch)
+    return count
+
+
+def full_text_search(queryset, query):
+    """Отбирает объекты, подходящие под запрос, от более релевантных."""
+    meta = queryset.model._meta
+    if connection.vendor == 'postgresql':
+        search_query = SearchQuery(query, config=CONFIG)
+        vector = SearchVector('text', config=CONFIG)
+        return queryset.annotate(
+            search=vector, rank=SearchRank(vector, search_query)
+        ).filter(search=search_query).order_by('-rank', '-pk')
+    if not uses_index_table():
+        for word in query.split():
+            queryset = queryset.filter(text__icontains=word)
+        return queryset
+    expression = match_expression(query)
+    if not expression:
+        return queryset.none()
+    quote = connection.ops.quote_name
+    table = quote(index_table(meta.db_table))
+    column = f'{quote(meta.db_table)}.{quote(meta.pk.column)}'
+    # Одно обращение к индексу FTS5, соединённое с таблицей по rowid.
+    return queryset.extra(
+        select={'rank': f'{table}.rank'},
+        tables=[index_table(meta.db_table)],
+        where=[f'{table}.rowid = {column}', f'{table} MATCH %s'],
+        params=[expression]
+    ).order_by('rank', '-pk')
+
+
+def title_prefixes(name_normalized):
+    """Префиксы нормализованного названия, хранимые для подсказок."""
+    length = min(len(name_normalized), settings.TITLE_SUGGEST_PREFIX_LENGTH)
+    return [name_normalized[:end] for end in range(1, length + 1)]
+
+
+def rebuild_title_prefixes(title_ids=None, chunk_size=2000):
+    """Заново заполняет префиксы названий; возвращает число строк."""
+    titles = Title.objects.order_by()
+    if title_ids is not None:
+        title_ids = list(title_ids)
+        titles = titles.filter(pk__in=title_ids)
+    table = connection.ops.quote_name(TitlePrefix._meta.db_table)
+    rows = titles.values_list('pk', 'name_normalized', 'rating').iterator(
+        chunk_size=chunk_size
+    )
+    count = 0
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            if title_ids is None:
+                cursor.execute(f'DELETE FROM {table}')
+            elif title_ids:
+                placeholders = ', '.join(['%s'] * len(title_ids))
+                cursor.execute(
+                    f'DELETE FROM {table} WHERE title_id IN ({placeholders})',
+                    title_ids
+                )
+        batch = []
+        for pk, name_normalized, rating in rows:
+            batch.extend(
+                TitlePrefix(title_id=pk, prefix=prefix, rating=rating or 0)
+                for prefix in title_prefixes(name_normalized)
+            )
+            if len(batch) >= chunk_size:
+                TitlePrefix.objects.bulk_create(batch)
+                count += len(batch)
+                batch = []
+        TitlePrefix.objects.bulk_create(batch)
+        count += len(batch)
+    return count
+
+
+def update_prefix_ratings(title_ids=None):
+    """Копирует рейтинг произведений в их префиксы одним UPDATE."""
+    prefixes = TitlePrefix.objects.all()
+    if title_ids is not None:
+        prefixes = prefixes.filter(title_id__in=title_ids)
+    return prefixes.update(rating=Coalesce(
+        Subquery(
+            Title.objects.filter(pk=OuterRef('title_id')).values('rating'),
+            output_field=FloatField()
+        ),
+        Value(0.0)
+    ))
+
+
+def suggest_titles(query, limit):
+    """Произведения с названием, начинающимся с ``query``, по рейтингу.
+
+    Для каждого префикса названия длиной до
+    ``settings.TITLE_SUGGEST_PREFIX_LENGTH`` хранится строка с копией
+    рейтинга, поэтому лучшие ``limit`` произведений читаются из индекса
+    ``(prefix, -rating, title)`` по порядку, без сортировки совпадений.
+    Более длинный запрос дополнительно сверяется с полным названием.
+    """
+    prefix = normalize_name(query)
+    if not prefix:
+        return []
+    length = settings.TITLE_SUGGEST_PREFIX_LENGTH
+    matches = TitlePrefix.objects.filter(prefix=prefix[:length])
+    if len(prefix) > length:
+        matches = matches.filter(
+            title__name_normalized__gte=prefix,
+            title__name_normalized__lt=prefix + PREFIX_END
+        )
+    pks = list(matches.order_by('-rating', 'title_id').values_list(
+        'title_id', flat=True
+    )[:limit])
+    titles = Title.objects.in_bulk(pks)
+    return [titles[pk] for pk in pks]
@@ -0,0 +1,168 @@
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_migrate,
+    post_save
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from reviews.generations import (
+    AUTHORS,
+    CATEGORIES,
+    COMMENTS,
+    GENRES,
+    RESOURCES,
+    REVIEWS,
+    TITLES,
+    bump,
+    bump_on_commit
+)
+from reviews.lookups import LOOKUP_TABLES
+from reviews.models import (
+    Category,
+    Comment,
+    Genre,
+    GenreTitle,
+    Review,
+    Title,
+    User
+)
+from reviews.ratings import apply_review_delta, rebuild_ratings
+from reviews.search import (
+    rebuild_title_prefixes,
+    remove_from_index,
+    update_index
+)
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    if created:
+        apply_review_delta(instance.title_id, instance.score, 1)
+    else:
+        # Старая оценка в памяти могла устареть из-за параллельного
+        # изменения того же отзыва, поэтому при правке сумма
+        # пересчитывается по таблице отзывов одним UPDATE.
+        title_ids = {instance.title_id}
+        rating_state = getattr(instance, '_rating_state', None)
+        if rating_state is not None:
+            title_ids.add(rating_state[0])
+        rebuild_ratings(title_ids)
+    instance.remember_rating_state()
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, **kwargs):
+    cascade = getattr(instance, '_cascade', None)
+    if cascade is None:
+        apply_review_delta(instance.title_id, -instance.score, -1)
+    elif cascade['field'] != 'title' and cascade['title_ids']:
+        # Сигналы приходят, когда вся пачка уже удалена: рейтинг её
+        # произведений пересчитывается один раз. Рейтинг удаляемого
+        # произведения не пересчитывается вовсе.
+        rebuild_ratings(cascade['title_ids'])
+        cascade['title_ids'] = set()
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_save, sender=Comment)
+def update_search_index(sender, instance, raw, **kwargs):
+    if not raw:
+        update_index(instance)
+
+
+@receiver(post_delete, sender=Review)
+@receiver(post_delete, sender=Comment)
+def remove_search_index(sender, instance, **kwargs):
+    remove_from_index(instance)
+
+
+@receiver(post_save, sender=Title)
+def update_title_prefixes(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    if created or instance.name_normalized != getattr(
+        instance, '_loaded_name_normalized', None
+    ):
+        rebuild_title_prefixes([instance.pk])
+    instance._loaded_name_normalized = instance.name_normalized
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Genre)
+def invalidate_lookup_table(sender, **kwargs):
+    table = LOOKUP_TABLES[sender]
+    table.invalidate()
+    transaction.on_commit(table.invalidate)
+
+
+@receiver(post_migrate)
+def invalidate_lookup_tables(sender, **kwargs):
+    for table in LOOKUP_TABLES.values():
+        table.invalidate()
+    bump(*RESOURCES)
+
+
+# Ресурсы API, ответы которых зависят от модели.
+DEPENDENT_RESOURCES = {
+    Title: (TITLES,),
+    GenreTitle: (TITLES,),
+    Category: (CATEGORIES, TITLES),
+    Genre: (GENRES, TITLES),
+    Review: (REVIEWS, TITLES),
+    Comment: (COMMENTS,),
+}
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_generations(sender, **kwargs):
+    if sender in DEPENDENT_RESOURCES:
+        bump_on_commit(*DEPENDENT_RESOURCES[sender])
+
+
+@receiver(m2m_changed, sender=GenreTitle)
+def bump_title_generation(sender, instance, action, reverse, pk_set,
+                          **kwargs):
+    if not action.startswith('post_'):
+        return
+    bump_on_commit(TITLES)
+    titles = Title.objects.filter(pk__in=pk_set or ()) if reverse else (
+        Title.objects.filter(pk=instance.pk)
+    )
+    titles.update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+def touch_genre_title(sender, instance, **kwargs):
+    Title.objects.filter(pk=instance.title_id).update(
+        updated_at=timezone.now()
+    )
+
+
+@receiver(post_save, sender=User)
+def bump_author_generations(sender, instance, created, **kwargs):
+    if not created and instance.username != getattr(
+        instance, '_loaded_username', None
+    ):
+        bump_on_commit(REVIEWS, COMMENTS, AUTHORS)
+    instance._loaded_username = instance.username
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """Настраивает новое соединение SQLite по PRAGMAS из профиля базы."""
+    pragmas = connection.settings_dict.get('PRAGMAS')
+    if connection.vendor != 'sqlite' or not pragmas:
+        return
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
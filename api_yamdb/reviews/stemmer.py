@@ -0,0 +1,135 @@
+"""Стеммер Портера (Snowball) для русского языка."""
+import re
+
+VOWELS = 'аеиоуыэюя'
+
+PERFECTIVE_GERUND = (
+    ('в', 'вши', 'вшись'),
+    ('ив', 'ивши', 'ившись', 'ыв', 'ывши', 'ывшись'),
+)
+ADJECTIVE = (
+    (),
+    ('ее', 'ие', 'ые', 'ое', 'ими', 'ыми', 'ей', 'ий', 'ый', 'ой', 'ем',
+     'им', 'ым', 'ом', 'его', 'ого', 'ему', 'ому', 'их', 'ых', 'ую', 'юю',
+     'ая', 'яя', 'ою', 'ею'),
+)
+PARTICIPLE = (
+    ('ем', 'нн', 'вш', 'ющ', 'щ'),
+    ('ивш', 'ывш', 'ующ'),
+)
+REFLEXIVE = ((), ('ся', 'сь'))
+VERB = (
+    ('ла', 'на', 'ете', 'йте', 'ли', 'й', 'л', 'ем', 'н', 'ло', 'но', 'ет',
+     'ют', 'ны', 'ть', 'ешь', 'нно'),
+    ('ила', 'ыла', 'ена', 'ейте', 'уйте', 'ите', 'или', 'ыли', 'ей', 'уй',
+     'ил', 'ыл', 'им', 'ым', 'ен', 'ило', 'ыло', 'ено', 'ят', 'ует', 'уют',
+     'ит', 'ыт', 'ены', 'ить', 'ыть', 'ишь', 'ую', 'ю'),
+)
+NOUN = ((), (
+    'а', 'ев', 'ов', 'ие', 'ье', 'е', 'иями', 'ями', 'ами', 'еи', 'ии', 'и',
+    'ией', 'ей', 'ой', 'ий', 'й', 'иям', 'ям', 'ием', 'ем', 'ам', 'ом', 'о',
+    'у', 'ах', 'иях', 'ях', 'ы', 'ь', 'ию', 'ью', 'ю', 'ия', 'ья', 'я',
+))
+SUPERLATIVE = ((), ('ейш', 'ейше'))
+DERIVATIONAL = ((), ('ост', 'ость'))
+
+WORD = re.compile(r'\w+')
+
+
+def suffixes(groups):
+    """Окончания группы от длинных к коротким.
+
+    Окончания первой группы допустимы только после «а» или «я».
+    """
+    after_a, anywhere = groups
+    return sorted(
+        [(ending, True) for ending in after_a]
+        + [(ending, False) for ending in anywhere],
+        key=lambda item: -len(item[0])
+    )
+
+
+GROUPS = {
+    name: suffixes(groups) for name, groups in (
+        ('perfective_gerund', PERFECTIVE_GERUND),
+        ('adjective', ADJECTIVE),
+        ('participle', PARTICIPLE),
+        ('reflexive', REFLEXIVE),
+        ('verb', VERB),
+        ('noun', NOUN),
+        ('superlative', SUPERLATIVE),
+        ('derivational', DERIVATIONAL),
+    )
+}
+
+
+def strip(word, group):
+    """Убирает самое длинное окончание группы; ``None``, если его нет."""
+    for ending, after_a in GROUPS[group]:
+        if word.endswith(ending):
+            if after_a and word[-len(ending) - 1:-len(ending)] not in (
+                'а', 'я'
+            ):
+                return None
+            return word[:-len(ending)]
+    return None
+
+
+def strip_optional(word, group):
+    stripped = strip(word, group)
+    return word if stripped is None else stripped
+
+
+def region(word, start):
+    """Позиция после первой согласной, следующей за гласной."""
+    for position in range(start + 1, len(word)):
+        if word[position - 1] in VOWELS and word[position] not in VOWELS:
+            return position + 1
+    return len(word)
+
+
+def strip_inflection(rv):
+    """Шаг 1: деепричастие или возвратная частица и окончание."""
+    stripped = strip(rv, 'perfective_gerund')
+    if stripped is not None:
+        return stripped
+    rv = strip_optional(rv, 'reflexive')
+    stripped = strip(rv, 'adjective')
+    if stripped is not None:
+        return strip_optional(stripped, 'participle')
+    stripped = strip(rv, 'verb')
+    if stripped is not None:
+        return stripped
+    return strip_optional(rv, 'noun')
+
+
+def stem(word):
+    word = word.lower().replace('ё', 'е')
+    match = re.search(f'[{VOWELS}]', word)
+    if match is None:
+        return word
+    prefix, rv = word[:match.end()], word[match.end():]
+    r2 = region(word, region(word, 0)) - len(prefix)
+
+    rv = strip_inflection(rv)
+    if rv.endswith('и'):
+        rv = rv[:-1]
+
+    stripped = strip(rv, 'derivational')
+    if stripped is not None and len(stripped) >= r2:
+        rv = stripped
+
+    if rv.endswith('нн'):
+        rv = rv[:-1]
+    else:
+        stripped = strip(rv, 'superlative')
+        if stripped is not None:
+            rv = stripped[:-1] if stripped.endswith('нн') else stripped
+        elif rv.endswith('ь'):
+            rv = rv[:-1]
+    return prefix + rv
+
+
+def stems(text):
+    """Основы всех слов текста."""
+    return [stem(word) for word in WORD.findall(text)]
@@ -0,0 +1,50 @@
+import pytest
+
+
+def query_budget(limit, *url_names, methods=None):
+    """Ограничивает число запросов к БД для каждого запроса к API в тесте.
+
+    Если переданы имена URL (`title-list`, `review-detail`, ...) или
+    HTTP-методы, проверяются только соответствующие запросы.
+    """
+    return pytest.mark.query_budget(limit, *url_names, methods=methods)
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers', 'query_budget(limit, *url_names, methods=None): бюджет запросов к БД на один запрос к API'
+    )
+
+
+@pytest.fixture(autouse=True)
+def _query_budget(request):
+    marker = request.node.get_closest_marker('query_budget')
+    if marker is None:
+        yield
+        return
+    from api.middleware import query_stats_recorded
+
+    limit, *url_names = marker.args
+    methods = marker.kwargs.get('methods')
+    exceeded = []
+
+    def check(sender, request, stats, **kwargs):
+        url_name = getattr(request.resolver_match, 'url_name', None)
+        if url_names and url_name not in url_names:
+            return
+        if methods and request.method not in methods:
+            return
+        if stats.count > limit:
+            exceeded.append(
+                f'{request.method} {request.get_full_path()} ({url_name}): {stats.count} запросов, '
+                f'повторы: {stats.duplicates}'
+            )
+
+    query_stats_recorded.connect(check, weak=False)
+    try:
+        yield
+    finally:
+        query_stats_recorded.disconnect(check)
+    assert not exceeded, (
+        f'Превышен бюджет в {limit} запросов к БД:\n' + '\n'.join(exceeded)
+    )
@@ -0,0 +1,10 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _clear_throttle_cache():
+    """Счётчики лимитов запросов не переходят из теста в тест."""
+    from django.conf import settings
+    from django.core.cache import caches
+
+    caches[settings.THROTTLE_CACHE_ALIAS].clear()
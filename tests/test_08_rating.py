@@ -0,0 +1,104 @@
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import auth_client, create_reviews
+
+
+class Test08StoredRating:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_rating_follows_reviews(self, admin_client, admin):
+        from reviews.models import Title
+
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        title = Title.objects.get(id=titles[0]['id'])
+        assert (title.rating_sum, title.review_count, title.rating) == (12, 3, 4), (
+            'Проверьте, что при создании отзыва обновляются `rating_sum`, `review_count` и `rating` произведения'
+        )
+
+        auth_client(user).patch(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[1]["id"]}/', data={'score': 9}
+        )
+        title.refresh_from_db()
+        assert (title.rating_sum, title.review_count, title.rating) == (18, 3, 6), (
+            'Проверьте, что при изменении оценки отзыва пересчитывается рейтинг произведения'
+        )
+
+        auth_client(moderator).delete(f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[1]["id"]}/')
+        title.refresh_from_db()
+        assert (title.rating_sum, title.review_count, title.rating) == (9, 2, 4.5), (
+            'Проверьте, что при удалении отзыва пересчитывается рейтинг произведения'
+        )
+
+        user.delete()
+        moderator.delete()
+        admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/')
+        title.refresh_from_db()
+        assert (title.rating_sum, title.review_count, title.rating) == (0, 0, None), (
+            'Проверьте, что у произведения без отзывов `rating` равен `None`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_rebuild_ratings_command(self, admin_client, admin):
+        from reviews.models import Title
+
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        call_command('rebuild_ratings', '--check')
+
+        Title.objects.update(rating_sum=0, review_count=0, rating=None)
+        with pytest.raises(CommandError):
+            call_command('rebuild_ratings', '--check')
+
+        call_command('rebuild_ratings')
+        call_command('rebuild_ratings', '--check')
+        response = admin_client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert response.json().get('rating') == 4, (
+            'Проверьте, что команда `rebuild_ratings` восстанавливает рейтинг произведения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_concurrent_review_edits(self, admin_client, admin):
+        from reviews.models import Review, Title
+
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        first = Review.objects.get(pk=reviews[0]['id'])
+        second = Review.objects.get(pk=reviews[0]['id'])
+        first.score, second.score = 7, 9
+        first.save()
+        second.save()
+        title = Title.objects.get(pk=first.title_id)
+        expected = sum(Review.objects.filter(title=title).values_list('score', flat=True))
+        assert title.rating_sum == expected, (
+            'Проверьте, что параллельные правки одного отзыва не искажают сумму оценок произведения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_cascade_delete(self, admin_client, admin):
+        from reviews.models import Review, Title, User
+
+        author = User.objects.create(username='critic', email='critic@yamdb.fake')
+        titles = [Title.objects.create(name=f'Произведение {number}', year=2000) for number in range(5)]
+        for title in titles:
+            Review.objects.create(title=title, author=author, text='Отзыв', score=8)
+            Review.objects.create(title=title, author=admin, text='Отзыв', score=2)
+
+        def title_updates(delete):
+            with CaptureQueriesContext(connection) as context:
+                delete()
+            return [
+                query for query in context.captured_queries
+                if query['sql'].startswith('UPDATE "reviews_title"')
+            ]
+
+        assert len(title_updates(titles[0].delete)) == 0, (
+            'Проверьте, что при удалении произведения его рейтинг не пересчитывается для каждого отзыва'
+        )
+        assert len(title_updates(author.delete)) == 1, (
+            'Проверьте, что при удалении автора рейтинг его произведений пересчитывается одним запросом'
+        )
+        assert set(Title.objects.values_list('rating', flat=True)) == {2}, (
+            'Проверьте, что после удаления автора рейтинг произведений не учитывает его отзывы'
+        )
+        call_command('rebuild_ratings', '--check')
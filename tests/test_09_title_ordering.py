@@ -0,0 +1,53 @@
+import pytest
+from django.db import connection
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from .common import create_reviews
+
+ORDERINGS = ('rating', '-rating', 'year', '-year', 'name', '-name', 'review_count', '-review_count')
+
+
+def title_list_queryset(params):
+    from api.views import TitleViewSet
+
+    view = TitleViewSet(action='list', format_kwarg=None, kwargs={})
+    view.request = Request(APIRequestFactory().get('/api/v1/titles/', params))
+    return view.filter_queryset(view.get_queryset())
+
+
+class Test09TitleOrdering:
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('ordering', ORDERINGS)
+    def test_01_title_ordering(self, client, admin_client, admin, ordering):
+        create_reviews(admin_client, admin)
+        admin_client.post('/api/v1/titles/', data={
+            'name': 'Без отзывов', 'year': 1990, 'genre': ['drama'], 'category': 'films'
+        })
+        response = client.get(f'/api/v1/titles/?ordering={ordering}&limit=10')
+        assert response.status_code == 200, (
+            f'Проверьте, что `/api/v1/titles/?ordering={ordering}` возвращает статус 200'
+        )
+        from reviews.models import Title
+        tiebreak = '-pk' if ordering.startswith('-') else 'pk'
+        expected = list(Title.objects.order_by(ordering, tiebreak).values_list('id', flat=True))
+        assert [title['id'] for title in response.json()['results']] == expected, (
+            f'Проверьте, что `/api/v1/titles/?ordering={ordering}` сортирует произведения по полю '
+            f'`{ordering.lstrip("-")}`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('ordering', ORDERINGS)
+    @pytest.mark.parametrize('params', ({}, {'category': 'films'}, {'year': 2000}))
+    def test_02_title_ordering_uses_index(self, ordering, params):
+        if connection.vendor != 'sqlite':
+            pytest.skip('План запроса проверяется только для SQLite')
+        if 'year' in params and ordering.lstrip('-') == 'year':
+            pytest.skip('Сортировка по фильтруемому полю не требует индекса')
+        from reviews.models import Category
+        Category.objects.create(name='Фильм', slug='films')
+        plan = title_list_queryset({**params, 'ordering': ordering}).explain()
+        assert 'TEMP B-TREE' not in plan, (
+            f'Запрос `/api/v1/titles/?{params} ordering={ordering}` сортирует без индекса:\n{plan}'
+        )
@@ -0,0 +1,92 @@
+import pytest
+
+from .common import create_comments
+
+
+def walk(client, url):
+    ids, previous = [], None
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что при GET запросе `{url}` с курсором возвращается статус 200'
+        )
+        data = response.json()
+        assert 'count' not in data, (
+            'Проверьте, что при курсорной пагинации не выполняется подсчёт `count`'
+        )
+        ids.extend(item['id'] for item in data['results'])
+        previous, url = data['previous'], data['next']
+    return ids, previous
+
+
+class Test10CursorPagination:
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('ordering', ('', '-rating', 'rating', 'year', '-name', 'review_count'))
+    def test_01_titles_cursor(self, client, admin_client, admin, ordering):
+        _, _, titles, _, _ = create_comments(admin_client, admin)
+        for name in ('Первый', 'Второй', 'Третий'):
+            admin_client.post('/api/v1/titles/', data={
+                'name': name, 'year': 2000, 'genre': ['drama'], 'category': 'films'
+            })
+        expected = [
+            title['id'] for title in client.get(f'/api/v1/titles/?ordering={ordering}&limit=100').json()['results']
+        ]
+        ids, previous = walk(client, f'/api/v1/titles/?ordering={ordering}&cursor=&limit=2')
+        assert ids == expected, (
+            'Проверьте, что курсорная пагинация `/api/v1/titles/?cursor=` возвращает произведения '
+            'в том же порядке, что и пагинация по `limit`/`offset`'
+        )
+        back = client.get(previous).json()
+        assert [title['id'] for title in back['results']] == expected[-3:-1], (
+            'Проверьте, что ссылка `previous` курсорной пагинации ведёт на предыдущую страницу'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_reviews_and_comments_cursor(self, client, admin_client, admin):
+        from reviews.models import Review
+
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        Review.objects.update(pub_date=Review.objects.first().pub_date)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        ids, _ = walk(client, url + '?cursor=&limit=1')
+        assert ids == [review['id'] for review in client.get(url).json()['results']], (
+            f'Проверьте, что курсорная пагинация `{url}?cursor=` сортирует отзывы по `(-pub_date, -id)`'
+        )
+        assert sorted(ids, reverse=True) == ids, (
+            'Проверьте, что отзывы с одинаковой датой упорядочены по `id`'
+        )
+        url = f'{url}{reviews[0]["id"]}/comments/'
+        ids, _ = walk(client, url + '?cursor=&limit=2')
+        assert sorted(ids) == sorted(comment['id'] for comment in comments), (
+            f'Проверьте, что курсорная пагинация `{url}?cursor=` возвращает все комментарии'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_invalid_cursor(self, client):
+        response = client.get('/api/v1/titles/?cursor=cD0lNUIxJTVE')
+        assert response.status_code == 404, (
+            'Проверьте, что при неверном курсоре возвращается статус 404'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('url, position', (
+        ('/api/v1/titles/?ordering=-rating', '["много", "1"]'),
+        ('/api/v1/titles/?ordering=-rating', '[[1], "1"]'),
+        ('/api/v1/titles/?ordering=-rating', '[1]'),
+        ('/api/v1/titles/?ordering=year', '[{"a": 1}, "1"]'),
+        ('/api/v1/titles/{title}/reviews/?limit=1', '["вчера", "1"]'),
+        ('/api/v1/titles/{title}/reviews/?limit=1', '["2021-01-01T00:00:00Z", "x"]'),
+    ))
+    def test_04_tampered_cursor(self, client, admin_client, admin, url, position):
+        import base64
+        from urllib.parse import urlencode
+
+        _, _, titles, _, _ = create_comments(admin_client, admin)
+        url = url.format(title=titles[0]['id'])
+        assert client.get(url).status_code == 200
+        cursor = base64.b64encode(urlencode({'p': position}).encode()).decode()
+        response = client.get(f'{url}&cursor={cursor}')
+        assert response.status_code == 404, (
+            'Проверьте, что курсор с неверными значениями ключа возвращает статус 404'
+        )
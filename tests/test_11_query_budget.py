@@ -0,0 +1,114 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_comments
+from .fixtures.fixture_query_budget import query_budget
+
+LIST_BUDGETS = (
+    ('/api/v1/categories/', 0),
+    ('/api/v1/genres/', 0),
+    ('/api/v1/titles/', 3),
+    ('/api/v1/titles/{title_id}/reviews/', 3),
+    ('/api/v1/titles/{title_id}/reviews/{review_id}/comments/', 3),
+)
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200, (
+        f'Проверьте, что при GET запросе `{url}` возвращается статус 200'
+    )
+    return len(context)
+
+
+class Test11QueryBudget:
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('url,budget', LIST_BUDGETS)
+    def test_01_list_query_budget(self, client, admin_client, admin, url, budget):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        url = url.format(title_id=titles[0]['id'], review_id=reviews[0]['id'])
+        client.get(url)
+        one = count_queries(client, f'{url}?limit=1')
+        many = count_queries(client, f'{url}?limit=100')
+        assert one == many, (
+            f'Проверьте, что число запросов к БД для `{url}` не зависит от размера страницы: '
+            f'{one} при limit=1 и {many} при limit=100'
+        )
+        assert many <= budget, (
+            f'Проверьте, что GET запрос `{url}` выполняет не более {budget} запросов к БД, сейчас {many}'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_users_query_budget(self, admin_client, admin):
+        create_comments(admin_client, admin)
+        one = count_queries(admin_client, '/api/v1/users/?limit=1')
+        many = count_queries(admin_client, '/api/v1/users/?limit=100')
+        assert one == many <= 3, (
+            'Проверьте, что число запросов к БД для `/api/v1/users/` не зависит от размера страницы'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    @query_budget(4, 'title-list', 'title-detail', 'review-list', 'review-detail', 'comment-list', methods=('GET',))
+    def test_03_query_budget_marker(self, client, admin_client, admin):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        for api_client in (client, admin_client):
+            api_client.get('/api/v1/titles/?limit=100')
+            api_client.get(url)
+            api_client.get(f'{url}reviews/?limit=100')
+            api_client.get(f'{url}reviews/{reviews[0]["id"]}/')
+            api_client.get(f'{url}reviews/{reviews[0]["id"]}/comments/?limit=100')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_query_budget_middleware(self, client, admin_client, admin, settings, caplog):
+        _, _, titles, _, _ = create_comments(admin_client, admin)
+        settings.DEBUG = True
+        response = client.get('/api/v1/titles/')
+        assert response['X-Query-Count'] == '3', (
+            'Проверьте, что в режиме DEBUG в заголовке `X-Query-Count` возвращается число запросов к БД'
+        )
+        assert 'X-Query-Time' in response and response['X-Query-Duplicates'] == '0', (
+            'Проверьте, что в режиме DEBUG возвращаются заголовки `X-Query-Time` и `X-Query-Duplicates`'
+        )
+
+        settings.QUERY_BUDGET = {'URL_NAMES': {'review-list': 1}}
+        caplog.clear()
+        with caplog.at_level('WARNING', logger='api.query_budget'):
+            client.get(f'/api/v1/titles/{titles[0]["id"]}/reviews/')
+            client.get('/api/v1/titles/')
+        assert len(caplog.records) == 1 and 'review-list' in caplog.records[0].getMessage(), (
+            'Проверьте, что превышение бюджета запросов записывается в журнал с именем URL'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_lookup_tables(self, client, admin_client, admin):
+        from reviews.models import Category
+
+        _, _, titles, _, _ = create_comments(admin_client, admin)
+        client.get('/api/v1/categories/')
+        client.get('/api/v1/genres/')
+        data = {'name': 'Новинка', 'year': 2001, 'genre': ['horror', 'drama'], 'category': 'books'}
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post('/api/v1/titles/', data=data)
+        assert response.status_code == 201
+        assert not any(
+            '"slug" = ' in query['sql'] or '"slug" IN ' in query['sql'] for query in context.captured_queries
+        ), 'Проверьте, что slug категорий и жанров ищутся без запросов к БД'
+
+        admin_client.post('/api/v1/categories/', data={'name': 'Музыка', 'slug': 'music'})
+        response = client.get('/api/v1/categories/?search=муз')
+        assert [category['slug'] for category in response.json()['results']] == ['music'], (
+            'Проверьте, что новая категория сразу появляется в списке `/api/v1/categories/`'
+        )
+        Category.objects.filter(slug='music').update(name='Песни')
+        admin_client.delete('/api/v1/categories/books/')
+        assert [category['name'] for category in client.get('/api/v1/categories/').json()['results']] == [
+            'Песни', 'Фильм'
+        ], 'Проверьте, что удаление категории обновляет список `/api/v1/categories/`'
+        response = admin_client.post('/api/v1/titles/', data=dict(data, category='books'))
+        assert response.status_code == 400, (
+            'Проверьте, что удалённую категорию нельзя указать у произведения'
+        )
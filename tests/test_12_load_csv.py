@@ -0,0 +1,177 @@
+import csv
+import gzip
+import os
+import shutil
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .conftest import MANAGE_PATH
+
+DATA_DIR = os.path.join(MANAGE_PATH, 'static', 'data')
+TABLES = (
+    ('users.csv', 'User'), ('category.csv', 'Category'), ('genre.csv', 'Genre'), ('titles.csv', 'Title'),
+    ('review.csv', 'Review'), ('comments.csv', 'Comment'), ('genre_title.csv', 'GenreTitle'),
+)
+
+
+def csv_rows(file_name, directory=DATA_DIR):
+    with open(os.path.join(directory, file_name), encoding='UTF-8') as df:
+        return list(csv.DictReader(df))
+
+
+class Test12LoadCsv:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_load_csv(self):
+        from django.apps import apps
+
+        with CaptureQueriesContext(connection) as context:
+            call_command('load_csv', DATA_DIR)
+        for file_name, model_name in TABLES:
+            model = apps.get_model('reviews', model_name)
+            assert model.objects.count() == len(csv_rows(file_name)), (
+                f'Проверьте, что команда `load_csv` загружает все строки из `{file_name}`'
+            )
+        assert len(context) < 40, (
+            'Проверьте, что число запросов `load_csv` зависит от числа пачек, а не от числа строк: '
+            f'выполнено {len(context)} запросов'
+        )
+        call_command('rebuild_ratings', '--check')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_load_csv_broken_reference(self, tmp_path):
+        from reviews.models import Review
+
+        for file_name, _ in TABLES:
+            shutil.copy(os.path.join(DATA_DIR, file_name), tmp_path)
+        rows = csv_rows('review.csv')
+        rows[-1]['author'] = '999999'
+        with open(tmp_path / 'review.csv', 'w', encoding='UTF-8', newline='') as df:
+            writer = csv.DictWriter(df, fieldnames=rows[0].keys())
+            writer.writeheader()
+            writer.writerows(rows)
+        with pytest.raises(CommandError, match='999999'):
+            call_command('load_csv', str(tmp_path))
+        assert not Review.objects.exists(), (
+            'Проверьте, что `load_csv` не сохраняет таблицу с нарушенной ссылочной целостностью'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_load_csv_gzip_batches(self, tmp_path):
+        from reviews.models import Review
+
+        for file_name, _ in TABLES:
+            source = os.path.join(DATA_DIR, file_name)
+            if file_name == 'review.csv':
+                with open(source, 'rb') as df, gzip.open(tmp_path / 'review.csv.gz', 'wb') as gz:
+                    shutil.copyfileobj(df, gz)
+            else:
+                shutil.copy(source, tmp_path)
+        with CaptureQueriesContext(connection) as small:
+            call_command('load_csv', str(tmp_path), '--batch-size', '10')
+        assert Review.objects.count() == len(csv_rows('review.csv')), (
+            'Проверьте, что `load_csv` читает сжатый файл `review.csv.gz`'
+        )
+        reviews = [query for query in small.captured_queries if 'INSERT INTO "reviews_review"' in query['sql']]
+        assert len(reviews) == -(-len(csv_rows('review.csv')) // 10), (
+            'Проверьте, что `load_csv` сохраняет отзывы пачками размера `--batch-size`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('broken', (False, True))
+    def test_04_load_csv_workers(self, tmp_path, broken):
+        from django.apps import apps
+
+        for file_name, _ in TABLES:
+            shutil.copy(os.path.join(DATA_DIR, file_name), tmp_path)
+        if broken:
+            os.remove(tmp_path / 'comments.csv')
+            with pytest.raises(CommandError, match='comments.csv'):
+                call_command('load_csv', str(tmp_path), '--workers', '3', '--batch-size', '5')
+            return
+        call_command('load_csv', str(tmp_path), '--workers', '3', '--batch-size', '5')
+        for file_name, model_name in TABLES:
+            assert apps.get_model('reviews', model_name).objects.count() == len(csv_rows(file_name)), (
+                f'Проверьте, что `load_csv --workers` загружает все строки из `{file_name}`'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_load_csv_upsert(self, tmp_path):
+        from io import StringIO
+
+        from reviews.models import Review, Title
+
+        for file_name, _ in TABLES:
+            shutil.copy(os.path.join(DATA_DIR, file_name), tmp_path)
+        call_command('load_csv', str(tmp_path))
+
+        rows = csv_rows('review.csv')
+        rows[0]['score'] = '1'
+        reviewed = {row['title_id'] for row in rows if row['author'] == rows[0]['author']}
+        title_id = next(title['id'] for title in csv_rows('titles.csv') if title['id'] not in reviewed)
+        rows.append(dict(rows[0], id='100500', title_id=title_id))
+        with open(tmp_path / 'review.csv', 'w', encoding='UTF-8', newline='') as df:
+            writer = csv.DictWriter(df, fieldnames=rows[0].keys())
+            writer.writeheader()
+            writer.writerows(rows)
+
+        out = StringIO()
+        call_command('load_csv', str(tmp_path), '--mode', 'upsert', stdout=out)
+        assert 'review.csv: {} строк, записано 2'.format(len(rows)) in out.getvalue(), (
+            'Проверьте, что `load_csv --mode=upsert` записывает только новые и изменённые строки'
+        )
+        assert Review.objects.get(id=rows[0]['id']).score == 1 and Review.objects.filter(id=100500).exists(), (
+            'Проверьте, что `load_csv --mode=upsert` обновляет изменённые и добавляет новые строки'
+        )
+        assert Title.objects.get(id=title_id).review_count == len(
+            [row for row in rows if row['title_id'] == title_id]
+        ), 'Проверьте, что после `load_csv --mode=upsert` пересчитывается рейтинг произведений'
+        call_command('rebuild_ratings', '--check')
+
+        out = StringIO()
+        call_command('load_csv', str(tmp_path), '--mode', 'upsert', stdout=out)
+        assert 'записано 0' in out.getvalue() and 'записано 1' not in out.getvalue(), (
+            'Проверьте, что повторная загрузка без изменений ничего не перезаписывает'
+        )
+        call_command('load_csv', str(tmp_path), '--mode', 'skip-existing')
+        assert Review.objects.count() == len(rows)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_load_csv_rebuilds_touched_ratings(self, tmp_path):
+        from reviews.models import Title
+
+        for file_name, _ in TABLES:
+            shutil.copy(os.path.join(DATA_DIR, file_name), tmp_path)
+        call_command('load_csv', str(tmp_path))
+        updated = dict(Title.objects.values_list('id', 'updated_at'))
+
+        for mode in ('skip-existing', 'upsert'):
+            call_command('load_csv', str(tmp_path), '--mode', mode)
+            assert dict(Title.objects.values_list('id', 'updated_at')) == updated, (
+                f'Проверьте, что `load_csv --mode={mode}` без изменений отзывов не перезаписывает произведения'
+            )
+
+        rows = csv_rows('review.csv')
+        moved = rows[0]
+        old_title_id = moved['title_id']
+        reviewed = {row['title_id'] for row in rows if row['author'] == moved['author']}
+        moved['title_id'] = next(
+            title['id'] for title in csv_rows('titles.csv') if title['id'] not in reviewed
+        )
+        with open(tmp_path / 'review.csv', 'w', encoding='UTF-8', newline='') as df:
+            writer = csv.DictWriter(df, fieldnames=rows[0].keys())
+            writer.writeheader()
+            writer.writerows(rows)
+        call_command('load_csv', str(tmp_path), '--mode', 'upsert')
+        changed = {
+            str(pk) for pk, updated_at in Title.objects.values_list('id', 'updated_at')
+            if updated_at != updated[pk]
+        }
+        assert changed == {old_title_id, moved['title_id']}, (
+            'Проверьте, что `load_csv --mode=upsert` пересчитывает рейтинг только '
+            'у старого и нового произведения изменённых отзывов'
+        )
+        call_command('rebuild_ratings', '--check')
@@ -0,0 +1,65 @@
+import csv
+import io
+import json
+import os
+
+import pytest
+from django.core.management import call_command
+
+from .common import create_comments
+from .test_12_load_csv import DATA_DIR, TABLES, csv_rows
+
+
+def content(response):
+    return b''.join(response.streaming_content).decode()
+
+
+class Test13Export:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_export_permissions(self, client, user_client):
+        for api_client in (client, user_client):
+            response = api_client.get('/api/v1/export/reviews/')
+            assert response.status_code in (401, 403), (
+                'Проверьте, что выгрузка `/api/v1/export/reviews/` доступна только администратору'
+            )
+        assert client.get('/api/v1/export/users/').status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_export_formats(self, admin_client, admin):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        response = admin_client.get('/api/v1/export/reviews/')
+        assert response.status_code == 200 and response.streaming, (
+            'Проверьте, что `/api/v1/export/reviews/` возвращает потоковый ответ'
+        )
+        assert response['Content-Type'].startswith('application/x-ndjson')
+        rows = [json.loads(line) for line in content(response).splitlines()]
+        assert sorted(row['id'] for row in rows) == sorted(review['id'] for review in reviews), (
+            'Проверьте, что `/api/v1/export/reviews/` выгружает все отзывы в формате NDJSON'
+        )
+
+        response = admin_client.get('/api/v1/export/titles/?format=csv')
+        assert response['Content-Type'].startswith('text/csv')
+        rows = list(csv.DictReader(io.StringIO(content(response))))
+        assert [row['name'] for row in rows] == [title['name'] for title in titles], (
+            'Проверьте, что `/api/v1/export/titles/?format=csv` выгружает произведения в формате CSV'
+        )
+
+        response = admin_client.get('/api/v1/export/comments/', HTTP_ACCEPT='text/csv')
+        rows = list(csv.DictReader(io.StringIO(content(response))))
+        assert {row['text'] for row in rows} == {comment['text'] for comment in comments}
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_dump_csv_round_trip(self, tmp_path):
+        call_command('load_csv', DATA_DIR)
+        call_command('dump_csv', str(tmp_path))
+        for file_name, _ in TABLES:
+            original = sorted(csv_rows(file_name), key=lambda row: int(row['id']))
+            dumped = csv_rows(file_name, str(tmp_path))
+            columns = set(original[0]) - {'pub_date'}
+            assert [{key: row[key] for key in columns} for row in dumped] == [
+                {key: row[key] for key in columns} for row in original
+            ], f'Проверьте, что `dump_csv` выгружает `{file_name}` в формате `load_csv`'
+
+        call_command('dump_csv', str(tmp_path), '--format', 'ndjson', '--gzip')
+        assert os.path.exists(tmp_path / 'review.ndjson.gz')
@@ -0,0 +1,96 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from .common import create_reviews
+
+
+def claims_client(client, user):
+    client.post('/api/v1/auth/signup/', data={'username': user.username, 'email': user.email})
+    user.refresh_from_db()
+    response = client.post(
+        '/api/v1/auth/token/', data={'username': user.username, 'confirmation_code': user.confirmation_code}
+    )
+    api_client = APIClient()
+    api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {response.json()["token"]}')
+    return api_client, response.json()['token']
+
+
+class Test14StatelessAuth:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_token_claims(self, client, user):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        _, token = claims_client(client, user)
+        token = AccessToken(token)
+        assert (token['username'], token['role'], token['is_staff']) == (user.username, 'user', False), (
+            'Проверьте, что access-токен содержит `username`, `role` и `is_staff` пользователя'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_no_user_query(self, client, admin_client, admin):
+        reviews, titles, user, _ = create_reviews(admin_client, admin)
+        user_client, _ = claims_client(client, user)
+        url = f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data={'text': 'Текст', 'score': 7})
+        assert response.status_code == 201 and response.json()['author'] == user.username, (
+            'Проверьте, что пользователь с токеном из `/api/v1/auth/token/` может оставить отзыв'
+        )
+        user_queries = [
+            query for query in context.captured_queries
+            if query['sql'].startswith('SELECT') and 'FROM "reviews_user"' in query['sql']
+        ]
+        assert len(user_queries) <= 1, (
+            'Проверьте, что аутентификация по токену не загружает пользователя из базы данных'
+        )
+        with CaptureQueriesContext(connection) as anonymous:
+            client.get(url)
+        with CaptureQueriesContext(connection) as authenticated:
+            user_client.get(url)
+        assert len(authenticated) == len(anonymous), (
+            'Проверьте, что аутентификация по токену не выполняет запросов к базе данных'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_role_change_and_deactivation(self, client, admin_client, admin):
+        reviews, titles, user, _ = create_reviews(admin_client, admin)
+        user_client, _ = claims_client(client, user)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        assert user_client.delete(url).status_code == 403
+
+        admin_client.patch(f'/api/v1/users/{user.username}/', data={'role': 'moderator'})
+        assert user_client.delete(url).status_code == 204, (
+            'Проверьте, что смена роли пользователя учитывается для уже выданных токенов'
+        )
+
+        user.refresh_from_db()
+        user.is_active = False
+        user.save()
+        assert user_client.get('/api/v1/titles/').status_code == 401, (
+            'Проверьте, что токен деактивированного пользователя не принимается'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_state_cache_eviction(self, client, admin):
+        from django.core.cache import cache
+
+        from reviews.models import User
+
+        admin_token_client, _ = claims_client(client, admin)
+        assert admin_token_client.get('/api/v1/users/').status_code == 200
+        User.objects.filter(pk=admin.pk).update(role=User.USER)
+        cache.clear()
+        assert admin_token_client.get('/api/v1/users/').status_code == 403, (
+            'Проверьте, что при промахе кеша роль пользователя берётся из базы, а не из токена'
+        )
+        User.objects.filter(pk=admin.pk).update(is_active=False)
+        cache.clear()
+        assert admin_token_client.get('/api/v1/titles/').status_code == 401, (
+            'Проверьте, что токен деактивированного пользователя не принимается после сброса кеша'
+        )
+        User.objects.filter(pk=admin.pk).delete()
+        cache.clear()
+        assert admin_token_client.get('/api/v1/titles/').status_code == 401
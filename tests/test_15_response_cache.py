@@ -0,0 +1,115 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import auth_client, create_reviews
+
+
+def queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(context), response.json()
+
+
+class Test15ResponseCache:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_anonymous_lists_cached(self, client, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        for url in (
+            '/api/v1/titles/?year=2000&ordering=-rating', '/api/v1/categories/', '/api/v1/genres/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+        ):
+            _, first = queries(client, url)
+            count, second = queries(client, url)
+            # Отзывам нужна дата изменения произведения для ETag.
+            assert count <= url.endswith('/reviews/') and first == second, (
+                f'Проверьте, что повторный анонимный GET запрос `{url}` отдаётся из кеша'
+            )
+        count, _ = queries(client, '/api/v1/titles/?ordering=-rating&year=2000')
+        assert count == 0, 'Проверьте, что ключ кеша не зависит от порядка параметров запроса'
+        count, _ = queries(admin_client, '/api/v1/titles/?year=2000&ordering=-rating')
+        assert count > 0, 'Проверьте, что запросы с токеном не обслуживаются из кеша'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_writes_invalidate(self, client, admin_client, admin):
+        from reviews.models import Review
+
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[1]["id"]}/'
+        queries(client, '/api/v1/titles/')
+        reviews_url = f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+        queries(client, reviews_url)
+
+        auth_client(user).post(reviews_url, data={'text': 'Новый', 'score': 10})
+        _, data = queries(client, '/api/v1/titles/')
+        rating = next(title['rating'] for title in data['results'] if title['id'] == titles[1]['id'])
+        assert rating == client.get(url).json()['rating'], (
+            'Проверьте, что после нового отзыва список `/api/v1/titles/` не отдаётся из устаревшего кеша'
+        )
+        _, data = queries(client, reviews_url)
+        assert data['count'] == Review.objects.filter(title=titles[1]['id']).count(), (
+            'Проверьте, что после нового отзыва список отзывов не отдаётся из устаревшего кеша'
+        )
+
+        queries(client, '/api/v1/categories/')
+        admin_client.post('/api/v1/categories/', data={'name': 'Музыка', 'slug': 'music'})
+        _, data = queries(client, '/api/v1/categories/')
+        assert 'music' in [category['slug'] for category in data['results']]
+
+        user.username = 'Renamed'
+        user.save()
+        _, data = queries(client, reviews_url)
+        assert 'Renamed' in [review['author'] for review in data['results']], (
+            'Проверьте, что смена имени автора сбрасывает кеш списка отзывов'
+        )
+
+    def test_03_memory_bounded_cache(self):
+        from api.cache import MemoryBoundedLocMemCache
+
+        cache = MemoryBoundedLocMemCache('test-bounded', {'OPTIONS': {'MAX_BYTES': 3000}})
+        cache.clear()
+        for key in 'abc':
+            cache.set(key, b'x' * 900)
+        cache.get('a')
+        cache.set('d', b'x' * 900)
+        assert cache.get('b') is None and cache.get('a') is not None and cache.get('d') is not None, (
+            'Проверьте, что при превышении MAX_BYTES удаляются давно не читавшиеся записи'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_host_in_cache_key(self, client, admin_client, admin):
+        create_reviews(admin_client, admin)
+        url = '/api/v1/titles/?limit=1'
+        evil = client.get(url, HTTP_HOST='evil.example').json()
+        assert evil['next'].startswith('http://evil.example/')
+        response = client.get(url, HTTP_HOST='yamdb.example')
+        assert response.json()['next'].startswith('http://yamdb.example/'), (
+            'Проверьте, что закешированный ответ не отдаётся запросу с другим заголовком Host'
+        )
+        etag = client.get(url, HTTP_HOST='evil.example')['ETag']
+        assert client.get(url, HTTP_HOST='yamdb.example')['ETag'] != etag
+
+    def test_05_process_local_cache_check(self, settings):
+        from django.core.checks import run_checks
+
+        def warnings():
+            return [message.id for message in run_checks(tags=['caches'])]
+
+        settings.DEBUG = False
+        assert 'api.W001' in warnings(), (
+            'Проверьте, что проверка настроек предупреждает о кеше default в памяти процесса'
+        )
+        settings.CACHES = dict(settings.CACHES, default={
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': '/tmp/yamdb-test-cache',
+        })
+        assert 'api.W001' not in warnings(), (
+            'Проверьте, что общий кеш default не вызывает предупреждения'
+        )
+        settings.DEBUG = True
+        settings.CACHES = dict(settings.CACHES, default={
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        })
+        assert 'api.W001' not in warnings()
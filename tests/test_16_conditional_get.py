@@ -0,0 +1,86 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import auth_client, create_reviews
+
+
+def conditional_get(client, url, **headers):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url, **headers)
+    return response, len(context)
+
+
+class Test16ConditionalGet:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_etag_not_modified(self, client, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        for url in (
+            '/api/v1/titles/', f'/api/v1/titles/{titles[0]["id"]}/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+            '/api/v1/categories/', '/api/v1/genres/',
+        ):
+            response = client.get(url)
+            etag = response.get('ETag')
+            assert response.status_code == 200 and etag, (
+                f'Проверьте, что ответ на GET запрос `{url}` содержит заголовок ETag'
+            )
+            response, count = conditional_get(client, url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == 304, (
+                f'Проверьте, что GET запрос `{url}` с совпадающим If-None-Match возвращает статус 304'
+            )
+            assert response['ETag'] == etag and not response.content
+            assert count <= 1, (
+                f'Проверьте, что ответ 304 на `{url}` отдаётся без выборки данных'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_etag_changes(self, client, admin_client, admin):
+        _, titles, user, _ = create_reviews(admin_client, admin)
+        title_url = f'/api/v1/titles/{titles[1]["id"]}/'
+        reviews_url = f'{title_url}reviews/'
+        urls = ('/api/v1/titles/', title_url, reviews_url)
+        etags = {url: client.get(url)['ETag'] for url in urls}
+
+        auth_client(user).post(reviews_url, data={'text': 'Новый', 'score': 10})
+        for url in urls:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+            assert response.status_code == 200 and response['ETag'] != etags[url], (
+                f'Проверьте, что после нового отзыва ETag ответа `{url}` меняется'
+            )
+        other_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = client.get(other_url)
+        assert client.get(other_url, HTTP_IF_NONE_MATCH=response['ETag']).status_code == 304, (
+            'Проверьте, что отзыв к одному произведению не меняет ETag отзывов к другому'
+        )
+        assert client.get('/api/v1/titles/?year=1').get('ETag') != client.get('/api/v1/titles/').get('ETag'), (
+            'Проверьте, что ETag зависит от параметров запроса'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_last_modified(self, client, admin_client, admin):
+        _, titles, user, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+        last_modified = client.get(url).get('Last-Modified')
+        assert last_modified, (
+            'Проверьте, что список отзывов содержит заголовок Last-Modified'
+        )
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == 304, (
+            'Проверьте, что GET запрос с If-Modified-Since не старше Last-Modified возвращает статус 304'
+        )
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE='Mon, 01 Jan 2001 00:00:00 GMT')
+        assert response.status_code == 200
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_writes_unaffected(self, admin_client):
+        response = admin_client.post(
+            '/api/v1/categories/', data={'name': 'Музыка', 'slug': 'music'},
+            HTTP_IF_NONE_MATCH='*'
+        )
+        assert response.status_code == 201 and 'ETag' not in response, (
+            'Проверьте, что условные заголовки не влияют на POST запросы'
+        )
+        response = admin_client.get('/api/v1/titles/1000/')
+        assert response.status_code == 404
@@ -0,0 +1,93 @@
+import pytest
+
+from .common import auth_client, create_comments, create_titles, create_users_api
+
+
+def texts(client, url):
+    response = client.get(url)
+    assert response.status_code == 200, (
+        f'Проверьте, что при GET запросе `{url}` возвращается статус 200'
+    )
+    return [item['text'] for item in response.json()['results']]
+
+
+class Test17FullTextSearch:
+
+    def test_01_stemmer(self):
+        from reviews.stemmer import stem
+
+        for word, expected in (
+            ('книги', 'книг'), ('фильмов', 'фильм'), ('красивая', 'красив'),
+            ('ответственность', 'ответствен'), ('кажется', 'кажет'), ('ёлки', 'елк'),
+        ):
+            assert stem(word) == expected, (
+                f'Проверьте, что основа слова «{word}» — «{expected}»'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_reviews_search(self, admin_client, admin):
+        titles, _, _ = create_titles(admin_client)
+        user, moderator = create_users_api(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        for api_client, text in (
+            (admin_client, 'Красивые фильмы о войне'),
+            (auth_client(user), 'Красивый фильм, красивая музыка'),
+            (auth_client(moderator), 'Скучная книга'),
+        ):
+            api_client.post(url, data={'text': text, 'score': 5})
+
+        found = texts(admin_client, f'{url}?search=красивое')
+        assert found == ['Красивый фильм, красивая музыка', 'Красивые фильмы о войне'], (
+            'Проверьте, что `?search=` находит отзывы по основам слов и сортирует их по релевантности'
+        )
+        assert texts(admin_client, f'{url}?search=фильмами войны') == ['Красивые фильмы о войне'], (
+            'Проверьте, что `?search=` требует совпадения всех слов запроса'
+        )
+        assert texts(admin_client, f'{url}?search=муз') == ['Красивый фильм, красивая музыка'], (
+            'Проверьте, что слова запроса ищутся как префиксы'
+        )
+        assert texts(admin_client, f'{url}?search=!!!') == []
+        assert texts(
+            admin_client, f'/api/v1/titles/{titles[1]["id"]}/reviews/?search=книга'
+        ) == [], 'Проверьте, что поиск не выходит за пределы отзывов произведения'
+
+        response = admin_client.get(f'{url}?search=красивое&limit=1&cursor=')
+        assert response.status_code == 400, (
+            'Проверьте, что курсорная пагинация результатов поиска по релевантности возвращает статус 400'
+        )
+        response = admin_client.get(f'{url}?search=красивое&limit=1&offset=1')
+        assert [item['text'] for item in response.json()['results']] == ['Красивые фильмы о войне']
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_index_follows_changes(self, admin_client, admin):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        review_url = f'{url}{reviews[0]["id"]}/'
+        admin_client.patch(review_url, data={'text': 'Отличные декорации'})
+        assert texts(admin_client, f'{url}?search=декорация') == ['Отличные декорации'], (
+            'Проверьте, что изменённый текст отзыва попадает в поисковый индекс'
+        )
+        admin_client.delete(review_url)
+        assert texts(admin_client, f'{url}?search=декорация') == [], (
+            'Проверьте, что удалённый отзыв исчезает из поиска'
+        )
+
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[1]["id"]}/comments/'
+        admin_client.post(url, data={'text': 'Согласен с автором'})
+        assert texts(admin_client, f'{url}?search=автора') == ['Согласен с автором'], (
+            'Проверьте, что `?search=` работает для комментариев'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_rebuild_index(self, admin_client, admin):
+        from reviews.models import Review
+        from reviews.search import rebuild_index
+
+        _, titles, _, _ = create_comments(admin_client, admin)[1:]
+        Review.objects.filter(title=titles[0]['id']).update(text='Массовое обновление')
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/?search=массовый'
+        assert texts(admin_client, url) == []
+        assert rebuild_index(Review) == Review.objects.count()
+        assert len(texts(admin_client, url)) == 3, (
+            'Проверьте, что rebuild_index переиндексирует тексты, изменённые в обход сигналов'
+        )
@@ -0,0 +1,102 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_reviews
+
+URL = '/api/v1/titles/suggest/'
+
+
+def suggest(client, **params):
+    response = client.get(URL, params)
+    assert response.status_code == 200, (
+        f'Проверьте, что при GET запросе `{URL}` возвращается статус 200'
+    )
+    return response.json()
+
+
+class Test18TitleSuggest:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_suggest(self, client, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        admin_client.post('/api/v1/titles/', data={
+            'name': 'Прогулка', 'year': 1990, 'genre': ['drama'], 'category': 'films'
+        })
+        data = suggest(client, q='ПРО')
+        assert [title['name'] for title in data] == ['Проект', 'Прогулка'], (
+            'Проверьте, что подсказки ищут по префиксу названия без учёта регистра'
+        )
+        assert set(data[0]) == {'id', 'name', 'year', 'rating'}
+        assert [title['name'] for title in suggest(client, q='п')][0] == 'Поворот туда', (
+            'Проверьте, что подсказки отсортированы по рейтингу, произведения без оценок в конце'
+        )
+        assert [title['id'] for title in suggest(client, q='  поворот   ТУДА ')] == [titles[0]['id']], (
+            'Проверьте, что в запросе подсказок не учитываются лишние пробелы'
+        )
+        assert len(suggest(client, q='п', limit=1)) == 1, (
+            'Проверьте, что параметр limit ограничивает число подсказок'
+        )
+        assert suggest(client, q='туда') == [], (
+            'Проверьте, что подсказки ищут только по началу названия'
+        )
+        assert suggest(client) == []
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_suggest_follows_changes(self, client, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        suggest(client, q='ёлка')
+        admin_client.patch(f'/api/v1/titles/{titles[1]["id"]}/', data={'name': 'Ёлка'})
+        assert [title['id'] for title in suggest(client, q='елк')] == [titles[1]['id']], (
+            'Проверьте, что подсказки учитывают изменение названия произведения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('query', ('про', 'повесть о настоящем человеке'))
+    def test_03_prefix_index(self, query):
+        from reviews.search import suggest_titles
+
+        if connection.vendor != 'sqlite':
+            pytest.skip('План запроса проверяется только для SQLite')
+        with CaptureQueriesContext(connection) as context:
+            suggest_titles(query, 10)
+        sql = context.captured_queries[0]['sql']
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+        assert 'INDEX title_prefix_rating_idx' in plan, (
+            f'Проверьте, что поиск подсказок использует индекс по префиксу и рейтингу: {plan}'
+        )
+        assert 'TEMP B-TREE' not in plan, (
+            f'Проверьте, что подсказки не сортируют все совпадения с префиксом: {plan}'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_top_rated(self, settings):
+        from reviews.models import Review, Title, User
+        from reviews.search import suggest_titles
+
+        titles = {}
+        for name, rating in (('Альфа', 3), ('Арбуз', None), ('Астра', 9), ('Атлас', 10)):
+            titles[name] = Title.objects.create(name=name, year=2000, rating=rating)
+        assert [title.name for title in suggest_titles('а', 3)] == ['Атлас', 'Астра', 'Альфа'], (
+            'Проверьте, что подсказки - лучшие по рейтингу из всех совпадений с префиксом'
+        )
+        assert [title.name for title in suggest_titles('а', 10)][-1] == 'Арбуз'
+
+        author = User.objects.create(username='critic', email='critic@yamdb.fake')
+        Review.objects.create(title=titles['Арбуз'], author=author, text='Отзыв', score=10)
+        Review.objects.create(title=titles['Атлас'], author=author, text='Отзыв', score=1)
+        assert [title.name for title in suggest_titles('а', 2)] == ['Арбуз', 'Астра'], (
+            'Проверьте, что подсказки учитывают изменение рейтинга произведений'
+        )
+
+        titles['Альфа'].name = 'Борщ'
+        titles['Альфа'].save()
+        assert [title.name for title in suggest_titles('б', 10)] == ['Борщ']
+        assert 'Борщ' not in [title.name for title in suggest_titles('а', 10)]
+
+        settings.TITLE_SUGGEST_PREFIX_LENGTH = 3
+        assert [title.name for title in suggest_titles('арбуз', 10)] == ['Арбуз'], (
+            'Проверьте, что запрос длиннее хранимых префиксов сверяется с полным названием'
+        )
@@ -0,0 +1,97 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_titles
+
+
+def facets(client, query):
+    url = f'/api/v1/titles/?{query}'
+    response = client.get(url)
+    assert response.status_code == 200, (
+        f'Проверьте, что при GET запросе `{url}` возвращается статус 200'
+    )
+    return response.json()['facets']
+
+
+def counts(items, key='slug'):
+    return {item[key]: item['count'] for item in items}
+
+
+class Test19Facets:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_facet_counts(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        admin_client.post('/api/v1/titles/', data={
+            'name': 'Третий', 'year': 2000, 'genre': [genres[2]['slug']],
+            'category': categories[1]['slug']
+        })
+        data = facets(client, 'facets=genre,category,year')
+        assert counts(data['genre']) == {
+            genres[0]['slug']: 1, genres[1]['slug']: 1, genres[2]['slug']: 2
+        }, 'Проверьте, что `?facets=genre` считает произведения по жанрам'
+        assert data['genre'][0] == {'slug': genres[2]['slug'], 'name': genres[2]['name'], 'count': 2}, (
+            'Проверьте, что значения фасета отсортированы по убыванию числа произведений'
+        )
+        assert counts(data['category']) == {categories[0]['slug']: 1, categories[1]['slug']: 2}
+        assert data['year'] == [{'value': 2000, 'count': 2}, {'value': 2020, 'count': 1}], (
+            'Проверьте, что `?facets=year` считает произведения по годам'
+        )
+
+        data = facets(client, f'facets=category,year&genre={genres[2]["slug"]}')
+        assert set(data) == {'category', 'year'}
+        assert counts(data['category']) == {categories[1]['slug']: 2}, (
+            'Проверьте, что фасеты считаются по произведениям, отобранным текущим фильтром'
+        )
+        assert counts(data['year'], 'value') == {2000: 1, 2020: 1}
+
+        response = client.get('/api/v1/titles/?facets=rating')
+        assert response.status_code == 400, (
+            'Проверьте, что неизвестное поле в `?facets=` возвращает статус 400'
+        )
+        assert 'facets' not in client.get('/api/v1/titles/').json()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_facet_queries(self, admin_client):
+        create_titles(admin_client)
+        url = '/api/v1/titles/?facets=genre,category,year&year=2000'
+        admin_client.get(url)
+        with CaptureQueriesContext(connection) as plain:
+            admin_client.get('/api/v1/titles/?year=2000')
+        with CaptureQueriesContext(connection) as faceted:
+            admin_client.get(url)
+        assert len(faceted) - len(plain) <= 3, (
+            'Проверьте, что каждый фасет считается одним агрегирующим запросом'
+        )
+
+        admin_client.get('/api/v1/titles/?facets=genre,category,year')
+        with CaptureQueriesContext(connection) as cached:
+            admin_client.get('/api/v1/titles/?facets=genre,category,year&limit=1')
+        assert len(cached) == len(plain), (
+            'Проверьте, что счётчики по всему каталогу берутся из кеша'
+        )
+        admin_client.post('/api/v1/titles/', data={'name': 'Новое', 'year': 1999, 'genre': ['drama'], 'category': 'films'})
+        data = admin_client.get('/api/v1/titles/?facets=year').json()['facets']
+        assert {'value': 1999, 'count': 1} in data['year'], (
+            'Проверьте, что кеш счётчиков сбрасывается при изменении произведений'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_facet_query_budget(self, client, admin_client, caplog):
+        from reviews.lookups import categories, genres
+
+        create_titles(admin_client)
+        for table in (categories, genres):
+            table.invalidate()
+        caplog.clear()
+        with caplog.at_level('WARNING', logger='api.query_budget'):
+            for url in (
+                '/api/v1/titles/?facets=genre,category,year&year=2000',
+                '/api/v1/titles/?facets=genre,category,year',
+            ):
+                assert client.get(url).status_code == 200
+        assert not caplog.records, (
+            'Проверьте, что запросы с `?facets=` укладываются в бюджет запросов к БД: '
+            + '; '.join(record.getMessage() for record in caplog.records)
+        )
@@ -0,0 +1,100 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_reviews
+
+
+def title_ids(client, query):
+    url = f'/api/v1/titles/?{query}'
+    response = client.get(url)
+    assert response.status_code == 200, (
+        f'Проверьте, что при GET запросе `{url}` возвращается статус 200'
+    )
+    return sorted(title['id'] for title in response.json()['results'])
+
+
+class Test20TitleFilter:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_genres(self, client, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        first, second = titles[0]['id'], titles[1]['id']
+        genres = titles[0]['genre'] + titles[1]['genre']
+
+        assert title_ids(client, f'genre={genres[0]},{genres[2]}') == [first, second], (
+            'Проверьте, что `?genre=a,b` отбирает произведения с любым из жанров'
+        )
+        assert title_ids(client, f'genre={genres[0]},{genres[1]}') == [first], (
+            'Проверьте, что произведение с несколькими подходящими жанрами не дублируется'
+        )
+        assert title_ids(client, f'genre={genres[0]},{genres[1]}&genre_match=all') == [first], (
+            'Проверьте, что `?genre_match=all` отбирает произведения со всеми жанрами'
+        )
+        assert title_ids(client, f'genre={genres[0]},{genres[2]}&genre_match=all') == []
+        assert title_ids(client, f'genre={genres[0]},unknown&genre_match=all') == []
+        assert title_ids(client, f'genre={genres[0]},unknown') == [first]
+        assert client.get('/api/v1/titles/?genre_match=some').status_code == 400
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_ranges(self, client, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        first, second = titles[0]['id'], titles[1]['id']
+
+        assert title_ids(client, 'year__gte=2000&year__lte=2019') == [first], (
+            'Проверьте, что `?year__gte=` и `?year__lte=` отбирают произведения по диапазону лет'
+        )
+        assert title_ids(client, 'year__gte=2000') == [first, second]
+        assert title_ids(client, 'rating__gte=4&rating__lte=4') == [first], (
+            'Проверьте, что `?rating__gte=` и `?rating__lte=` отбирают произведения по рейтингу'
+        )
+        assert title_ids(client, 'rating__gte=5') == []
+        assert title_ids(client, f'category__in={titles[0]["category"]},{titles[1]["category"]}') == [first, second], (
+            'Проверьте, что `?category__in=a,b` отбирает произведения из любой из категорий'
+        )
+        assert title_ids(client, f'category__in={titles[1]["category"]},unknown') == [second]
+        assert title_ids(client, f'category={titles[0]["category"]}&year=2000') == [first]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_genre_filter_query(self):
+        from api.filters import TitleFilter
+        from reviews.models import Genre, Title
+
+        for slug in ('a', 'b', 'c', 'd'):
+            Genre.objects.create(name=slug, slug=slug)
+        for params in ({'genre': 'a,b,c,d'}, {'genre': 'a,b,c,d', 'genre_match': 'all'}):
+            sql = str(TitleFilter(params, queryset=Title.objects.all()).qs.query)
+            assert 'JOIN' not in sql.split('WHERE')[0], (
+                'Проверьте, что фильтр по жанрам не соединяет таблицу произведений с жанрами'
+            )
+            assert 'reviews_genre"' not in sql, (
+                'Проверьте, что слаги жанров переводятся в ключи без запроса к таблице жанров'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_unknown_slugs(self, client, admin_client, admin):
+        from django.core.cache import cache
+
+        from reviews.lookups import categories, genres
+        from reviews.models import Genre
+
+        create_reviews(admin_client, admin)
+        for table in (categories, genres):
+            table.all()
+        with CaptureQueriesContext(connection) as context:
+            for number in range(3):
+                assert title_ids(client, f'genre=nope{number},unknown&category=zzz{number}') == []
+        lookups = [
+            query['sql'] for query in context.captured_queries
+            if 'FROM "reviews_genre"' in query['sql'] or 'FROM "reviews_category"' in query['sql']
+        ]
+        assert not lookups, (
+            'Проверьте, что несуществующие слаги жанров и категорий не перечитывают справочник из БД: '
+            + '; '.join(lookups)
+        )
+
+        Genre.objects.bulk_create([Genre(name='Новый', slug='fresh')])
+        cache.incr(genres.version_key)
+        assert genres.get_by_slug('fresh') is not None, (
+            'Проверьте, что жанр, добавленный другим процессом, виден сразу после смены версии справочника'
+        )
@@ -0,0 +1,80 @@
+import pytest
+
+from .common import auth_client, create_comments
+
+URLS = (
+    '/api/v1/titles/',
+    '/api/v1/titles/?limit=2&offset=1',
+    '/api/v1/titles/?ordering=-rating',
+    '/api/v1/titles/?ordering=year&cursor=',
+    '/api/v1/titles/?genre=drama,comedy&facets=genre,year',
+    '/api/v1/titles/{title_id}/reviews/',
+    '/api/v1/titles/{title_id}/reviews/?limit=1&cursor=',
+    '/api/v1/titles/{title_id}/reviews/?search=qwerty',
+    '/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+    '/api/v1/titles/{title_id}/reviews/{review_id}/comments/?limit=1',
+)
+
+
+def pages(client, url):
+    """Содержимое всех страниц, начиная с ``url``, включая ссылку next."""
+    contents = []
+    while url and len(contents) < 10:
+        response = client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что при GET запросе `{url}` возвращается статус 200'
+        )
+        contents.append(response.content)
+        url = response.json().get('next')
+    return contents
+
+
+class Test21FastRead:
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('url', URLS)
+    def test_01_fast_read_contract(self, monkeypatch, admin_client, admin, url):
+        from api.views import CommentViewSet, ReviewViewSet, TitleViewSet
+        from reviews.models import Title
+
+        comments, reviews, titles, user, _ = create_comments(admin_client, admin)
+        admin_client.post('/api/v1/titles/', data={
+            'name': 'Без жанров', 'year': 1999, 'genre': [], 'category': 'books'
+        })
+        admin_client.post('/api/v1/titles/', data={
+            'name': 'Без категории', 'year': 2001, 'genre': ['drama', 'comedy'], 'category': 'films',
+            'description': 'Категория будет удалена'
+        })
+        auth_client(user).post(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/', data={'text': 'qwerty', 'score': 8}
+        )
+        admin_client.post(f'/api/v1/titles/{titles[1]["id"]}/reviews/', data={'text': 'Хорошо', 'score': 7})
+        Title.objects.filter(name='Без категории').update(category=None)
+        url = url.format(title_id=titles[0]['id'], review_id=reviews[0]['id'])
+
+        fast = pages(admin_client, url)
+        for viewset in (TitleViewSet, ReviewViewSet, CommentViewSet):
+            monkeypatch.setattr(viewset, 'list_rows_class', None)
+        assert pages(admin_client, url) == fast, (
+            f'Проверьте, что быстрый список `{url}` совпадает с ответом сериализатора байт в байт'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_fast_read_used(self, monkeypatch, admin_client, admin):
+        from api.serializers import CommentSerializer, ReviewSerializer, TitleReadSerializer
+
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+
+        def fail(self, instance):
+            raise AssertionError('Сериализатор вызван при чтении списка')
+
+        for serializer in (TitleReadSerializer, ReviewSerializer, CommentSerializer):
+            monkeypatch.setattr(serializer, 'to_representation', fail)
+        for url in (
+            '/api/v1/titles/', f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/comments/',
+        ):
+            response = admin_client.get(url)
+            assert response.status_code == 200 and response.json()['results'], (
+                f'Проверьте, что список `{url}` строится без сериализатора'
+            )
@@ -0,0 +1,106 @@
+import datetime as dt
+import decimal
+import io
+import json
+import uuid
+from collections import OrderedDict
+
+import pytest
+
+from .common import create_comments
+
+
+class Vector:
+    """Объект, который JSONEncoder превращает в список через ``tolist``."""
+
+    def __init__(self, value=1e16):
+        self.value = value
+
+    def tolist(self):
+        return [self.value, 0.5]
+
+
+PAYLOADS = (
+    {'text': 'Кириллица и «кавычки»', 'emoji': '🙂', 'escape': 'a"b\\c\n\t'},
+    [1, 2.5, -0.1, 10 ** 15, True, None, [], {}],
+    OrderedDict((('b', 1), ('a', [OrderedDict((('c', 'д'),))]))),
+    {
+        'pub_date': dt.datetime(2021, 5, 4, 3, 2, 1, 123456, tzinfo=dt.timezone.utc),
+        'date': dt.date(2021, 5, 4),
+        'time': dt.time(3, 2, 1),
+        'duration': dt.timedelta(days=1, seconds=5),
+        'decimal': decimal.Decimal('1.50'),
+        'uuid': uuid.UUID(int=1),
+    },
+    {'separator': 'строка\u2028абзац\u2029', 1: 'ключ-число'},
+    {'big': 2 ** 70},
+    [1e16, -1e16, 1e-7, 1e-5, 1.5e300, 5e-324, 9999999999999998.0, 1e-4, -0.0],
+    {'rating': 4.5, 'vector': Vector(), 1e-05: 'ключ-число'},
+    {'nan': float('nan')},
+    [1, {'inf': float('inf')}],
+    {'vector': Vector(float('-inf'))},
+)
+
+
+def rendered(renderer, data, media_type=None):
+    try:
+        return renderer.render(data, media_type)
+    except ValueError as error:
+        return type(error)
+
+
+class Test22FastJSON:
+
+    @pytest.mark.parametrize('data', PAYLOADS)
+    def test_01_renderer_output(self, data):
+        from rest_framework.renderers import JSONRenderer
+
+        from api.renderers import FastJSONRenderer
+
+        assert rendered(FastJSONRenderer(), data) == rendered(JSONRenderer(), data), (
+            'Проверьте, что FastJSONRenderer выдаёт те же байты, что и JSONRenderer, '
+            'и так же отклоняет NaN и бесконечность'
+        )
+        assert rendered(FastJSONRenderer(), data, 'application/json; indent=4') == (
+            rendered(JSONRenderer(), data, 'application/json; indent=4')
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_api_responses(self, admin_client, admin):
+        from rest_framework.renderers import JSONRenderer
+
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        for url in (
+            '/api/v1/titles/', f'/api/v1/titles/{titles[0]["id"]}/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/comments/',
+        ):
+            response = admin_client.get(url)
+            assert response.content == JSONRenderer().render(response.data), (
+                f'Проверьте, что ответ `{url}` совпадает с выводом JSONRenderer'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_parser(self, admin_client):
+        from rest_framework.exceptions import ParseError
+
+        from api.parsers import FastJSONParser
+
+        parser = FastJSONParser()
+        body = '{"name": "Ужасы", "big": 1180591620717411303424, "list": [1.5, null]}'.encode()
+        assert parser.parse(io.BytesIO(body)) == {
+            'name': 'Ужасы', 'big': 2 ** 70, 'list': [1.5, None]
+        }, 'Проверьте, что FastJSONParser разбирает JSON так же, как JSONParser'
+        for body in (b'{"a": NaN}', b'{"a": 1', b''):
+            with pytest.raises(ParseError):
+                parser.parse(io.BytesIO(body))
+
+        response = admin_client.post(
+            '/api/v1/genres/', data=json.dumps({'name': 'Мюзикл', 'slug': 'musical'}, ensure_ascii=False),
+            content_type='application/json'
+        )
+        assert response.status_code == 201 and response.json()['name'] == 'Мюзикл'
+        response = admin_client.post('/api/v1/genres/', data='{"name":', content_type='application/json')
+        assert response.status_code == 400, (
+            'Проверьте, что некорректный JSON в теле запроса возвращает статус 400'
+        )
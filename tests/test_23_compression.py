@@ -0,0 +1,103 @@
+import gzip
+import os
+
+import pytest
+from django.core.management import call_command
+
+from .common import create_comments, create_reviews
+
+
+@pytest.fixture
+def min_size(settings):
+    def set_min_size(value):
+        settings.COMPRESSION = dict(settings.COMPRESSION, MIN_SIZE=value)
+    return set_min_size
+
+
+class Test23Compression:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_gzip_negotiation(self, client, admin_client, admin, min_size):
+        create_reviews(admin_client, admin)
+        min_size(100)
+        plain = client.get('/api/v1/titles/')
+        response = client.get('/api/v1/titles/', HTTP_ACCEPT_ENCODING='gzip, deflate')
+        assert response['Content-Encoding'] == 'gzip', (
+            'Проверьте, что при `Accept-Encoding: gzip` ответ сжимается в gzip'
+        )
+        assert gzip.decompress(response.content) == plain.content
+        assert int(response['Content-Length']) == len(response.content)
+        assert 'Accept-Encoding' in response['Vary'], (
+            'Проверьте, что сжимаемый ответ содержит `Vary: Accept-Encoding`'
+        )
+        assert not plain.has_header('Content-Encoding')
+
+        for header in ('gzip;q=0', 'identity', 'gzip;q=0, *;q=1'):
+            response = client.get('/api/v1/titles/', HTTP_ACCEPT_ENCODING=header)
+            assert not response.has_header('Content-Encoding'), (
+                f'Проверьте, что при `Accept-Encoding: {header}` ответ не сжимается в gzip'
+            )
+        response = client.get('/api/v1/titles/', HTTP_ACCEPT_ENCODING='*')
+        assert response.has_header('Content-Encoding')
+
+        min_size(len(plain.content) + 1)
+        response = client.get('/api/v1/titles/', HTTP_ACCEPT_ENCODING='gzip')
+        assert not response.has_header('Content-Encoding'), (
+            'Проверьте, что ответы короче порога из настроек не сжимаются'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_etag(self, client, admin_client, admin, min_size):
+        create_reviews(admin_client, admin)
+        min_size(100)
+        etag = client.get('/api/v1/titles/')['ETag']
+        response = client.get('/api/v1/titles/', HTTP_ACCEPT_ENCODING='gzip')
+        assert response['ETag'] == f'W/{etag}', (
+            'Проверьте, что ETag сжатого ответа становится слабым'
+        )
+        for value in (etag, response['ETag']):
+            response = client.get(
+                '/api/v1/titles/', HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=value
+            )
+            assert response.status_code == 304, (
+                'Проверьте, что сжатие не мешает ответу 304 по If-None-Match'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_streaming(self, admin_client, admin, min_size):
+        create_comments(admin_client, admin)
+        min_size(10 ** 6)
+        plain = b''.join(admin_client.get('/api/v1/export/reviews/').streaming_content)
+        response = admin_client.get('/api/v1/export/reviews/', HTTP_ACCEPT_ENCODING='gzip')
+        assert response.streaming and response['Content-Encoding'] == 'gzip', (
+            'Проверьте, что потоковая выгрузка сжимается по частям'
+        )
+        assert not response.has_header('Content-Length')
+        assert gzip.decompress(b''.join(response.streaming_content)) == plain
+
+    def test_04_precompressed_static(self, settings, tmp_path):
+        settings.STATIC_ROOT = str(tmp_path)
+        call_command('collectstatic', interactive=False, verbosity=0)
+        source = os.path.join(settings.BASE_DIR, 'static', 'redoc.yaml')
+        with open(source, 'rb') as file:
+            content = file.read()
+        with gzip.open(tmp_path / 'redoc.yaml.gz') as file:
+            assert file.read() == content, (
+                'Проверьте, что collectstatic кладёт рядом с redoc.yaml сжатую копию'
+            )
+        assert not list(tmp_path.glob('**/*.csv.gz'))
+
+    def test_05_chunks_flushed(self):
+        import zlib
+
+        from api.compression import GZIP, compress_sequence
+
+        chunks = [f'{{"id": {number}, "text": "строка"}}\n'.encode() for number in range(5)]
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        stream = compress_sequence(iter(chunks), GZIP, 6)
+        for chunk in chunks:
+            assert decompressor.decompress(next(stream)) == chunk, (
+                'Проверьте, что каждая часть потока отправляется клиенту сразу после сжатия'
+            )
+        decompressor.decompress(b''.join(stream))
+        assert decompressor.eof
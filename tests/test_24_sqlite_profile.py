@@ -0,0 +1,60 @@
+import io
+
+import pytest
+from django.core.management import call_command
+from django.db.utils import ConnectionHandler
+
+from .common import create_comments
+
+
+class Test24SQLiteProfile:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_pragmas(self, settings, tmp_path):
+        profile = settings.DATABASE_PROFILES['sqlite-prod']
+        assert profile['CONN_MAX_AGE'], (
+            'Проверьте, что профиль sqlite-prod держит соединения открытыми'
+        )
+        connections = ConnectionHandler({
+            'default': dict(profile, NAME=str(tmp_path / 'db.sqlite3'))
+        })
+        connection = connections['default']
+        try:
+            with connection.cursor() as cursor:
+                values = {}
+                for name in ('journal_mode', 'synchronous', 'busy_timeout', 'cache_size', 'mmap_size'):
+                    cursor.execute(f'PRAGMA {name}')
+                    values[name] = cursor.fetchone()[0]
+        finally:
+            connection.close()
+        assert values['journal_mode'] == 'wal', (
+            'Проверьте, что соединение профиля sqlite-prod включает журнал WAL'
+        )
+        assert values == {
+            'journal_mode': 'wal',
+            'synchronous': 1,
+            'busy_timeout': profile['PRAGMAS']['busy_timeout'],
+            'cache_size': profile['PRAGMAS']['cache_size'],
+            'mmap_size': profile['PRAGMAS']['mmap_size'],
+        }, 'Проверьте, что при соединении выполняются все PRAGMA из профиля'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_default_profile(self):
+        from django.db import connection
+
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            assert cursor.fetchone()[0] == 2, (
+                'Проверьте, что профиль по умолчанию не меняет настройки SQLite'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_benchmark(self, admin_client, admin):
+        create_comments(admin_client, admin)
+        out = io.StringIO()
+        call_command(
+            'benchmark_concurrency', readers=1, writers=1, duration=0.2, stdout=out
+        )
+        assert 'Чтение' in out.getvalue() and 'Запись' in out.getvalue(), (
+            'Проверьте, что benchmark_concurrency выводит скорость чтения и записи'
+        )
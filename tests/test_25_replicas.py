@@ -0,0 +1,102 @@
+import io
+import time
+
+import pytest
+from django.core.management import call_command
+from django.db import connections
+
+from .common import auth_client, create_titles
+
+
+@pytest.fixture
+def replica(settings, tmp_path, transactional_db):
+    from api.replicas import replicate
+
+    connections.databases['replica'] = dict(
+        connections.databases['default'], NAME=str(tmp_path / 'replica.sqlite3')
+    )
+    settings.DATABASE_REPLICAS = ('replica',)
+    yield lambda: replicate('replica')
+    connections['replica'].close()
+    del connections.databases['replica']
+    delattr(connections._connections, 'replica')
+
+
+def rename_title(title_id, name):
+    from reviews.models import Title
+
+    Title.objects.filter(pk=title_id).update(name=name)
+
+
+class Test25Replicas:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_safe_reads_from_replica(self, client, admin_client, admin, replica):
+        from django.core.cache import cache
+
+        from api.replicas import LAST_WRITE_KEY
+
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        replica()
+        rename_title(titles[0]['id'], 'Новое название')
+
+        response = client.get(url)
+        assert response.json()['name'] == titles[0]['name'], (
+            'Проверьте, что GET запросы к произведениям читаются с реплики'
+        )
+        assert not response.has_header('ETag'), (
+            'Проверьте, что ответ с возможно отстающей реплики не получает ETag'
+        )
+        cache.delete(LAST_WRITE_KEY)
+        assert client.get(url).has_header('ETag')
+
+        replica()
+        assert client.get(url).json()['name'] == 'Новое название'
+        assert client.get('/api/v1/titles/?facets=year').status_code == 200
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_read_your_writes(self, settings, client, admin_client, admin, replica):
+        settings.DATABASE_REPLICA_LAG = 1
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        replica()
+        time.sleep(1.1)
+
+        response = admin_client.patch(url, data={'name': 'Исправлено'})
+        assert response.status_code == 200
+        assert admin_client.get(url).json()['name'] == 'Исправлено', (
+            'Проверьте, что после записи клиент читает с основной базы'
+        )
+        assert client.get(url).json()['name'] == titles[0]['name']
+        assert auth_client(admin).get(url).json()['name'] == titles[0]['name'], (
+            'Проверьте, что к основной базе закрепляется только писавший клиент'
+        )
+        time.sleep(1.1)
+        assert admin_client.get(url).json()['name'] == titles[0]['name'], (
+            'Проверьте, что закрепление за основной базой истекает через DATABASE_REPLICA_LAG'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_other_views_use_primary(self, admin, replica):
+        from api.replicas import ReplicaRouter
+        from reviews.models import User
+
+        replica()
+        User.objects.create_user(username='NewUser', email='newuser@yamdb.fake')
+        response = auth_client(admin).get('/api/v1/users/?search=NewUser')
+        assert response.json()['count'] == 1, (
+            'Проверьте, что запросы к пользователям не читаются с реплики'
+        )
+        assert not ReplicaRouter().allow_migrate('replica', 'reviews')
+        assert ReplicaRouter().allow_migrate('default', 'reviews')
+
+        out = io.StringIO()
+        call_command('sync_replicas', stdout=out)
+        with connections['replica'].cursor() as cursor:
+            cursor.execute(
+                'SELECT COUNT(*) FROM reviews_user WHERE username = %s', ['NewUser']
+            )
+            assert cursor.fetchone()[0] == 1, (
+                'Проверьте, что команда sync_replicas копирует основную базу в реплики'
+            )
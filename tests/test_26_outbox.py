@@ -0,0 +1,106 @@
+import datetime as dt
+import smtplib
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+
+class CountingBackend(EmailBackend):
+    opened = 0
+
+    def open(self):
+        CountingBackend.opened += 1
+        return True
+
+
+class FailingBackend(EmailBackend):
+
+    def send_messages(self, messages):
+        if any('fail' in message.to[0] for message in messages):
+            raise smtplib.SMTPRecipientsRefused({})
+        return super().send_messages(messages)
+
+
+class Test26Outbox:
+    url_signup = '/api/v1/auth/signup/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_signup_queues_email(self, client):
+        from reviews.models import OutboxEmail, User
+
+        data = {'email': 'outbox@yamdb.fake', 'username': 'outbox'}
+        response = client.post(self.url_signup, data=data)
+        assert response.status_code == 200
+        assert not mail.outbox, (
+            'Проверьте, что регистрация не отправляет письмо сама, а кладёт его в очередь'
+        )
+        email = OutboxEmail.objects.get()
+        user = User.objects.get(username='outbox')
+        assert email.recipient == data['email'] and user.confirmation_code in email.body, (
+            'Проверьте, что письмо с кодом подтверждения сохраняется в таблице исходящих'
+        )
+
+        call_command('send_outbox')
+        assert len(mail.outbox) == 1 and mail.outbox[0].to == [data['email']], (
+            'Проверьте, что команда send_outbox отправляет письма из очереди'
+        )
+        email.refresh_from_db()
+        assert email.sent_at is not None
+        call_command('send_outbox')
+        assert len(mail.outbox) == 1, 'Проверьте, что отправленные письма не уходят повторно'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_batches(self, settings):
+        from reviews.models import OutboxEmail
+        from reviews.outbox import queue_email
+
+        settings.EMAIL_BACKEND = 'tests.test_26_outbox.CountingBackend'
+        CountingBackend.opened = 0
+        for number in range(5):
+            queue_email('Тема', 'Текст', 'from@yamdb.fake', f'to{number}@yamdb.fake')
+        call_command('send_outbox', batch_size=2)
+        assert len(mail.outbox) == 5
+        assert CountingBackend.opened == 3, (
+            'Проверьте, что send_outbox открывает одно соединение на пачку писем'
+        )
+        assert not OutboxEmail.objects.filter(sent_at=None).exists()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_retries(self, settings):
+        from reviews.models import OutboxEmail
+        from reviews.outbox import queue_email
+
+        settings.EMAIL_BACKEND = 'tests.test_26_outbox.FailingBackend'
+        settings.EMAIL_OUTBOX = dict(settings.EMAIL_OUTBOX, MAX_ATTEMPTS=2, BACKOFF=10)
+        queue_email('Тема', 'Текст', 'from@yamdb.fake', 'ok@yamdb.fake')
+        failing = queue_email('Тема', 'Текст', 'from@yamdb.fake', 'fail@yamdb.fake')
+        started = timezone.now()
+        call_command('send_outbox')
+        assert [message.to for message in mail.outbox] == [['ok@yamdb.fake']], (
+            'Проверьте, что ошибка отправки одного письма не мешает остальным'
+        )
+        failing.refresh_from_db()
+        assert failing.sent_at is None and failing.attempts == 1 and failing.last_error
+        assert failing.send_after >= started + dt.timedelta(seconds=10), (
+            'Проверьте, что неудачное письмо откладывается на время BACKOFF'
+        )
+        call_command('send_outbox')
+        failing.refresh_from_db()
+        assert failing.attempts == 1, 'Проверьте, что письмо не повторяется раньше срока'
+
+        OutboxEmail.objects.update(send_after=started)
+        call_command('send_outbox')
+        failing.refresh_from_db()
+        assert failing.attempts == 2
+        assert failing.send_after >= started + dt.timedelta(seconds=20), (
+            'Проверьте, что пауза между попытками растёт экспоненциально'
+        )
+        OutboxEmail.objects.update(send_after=started)
+        call_command('send_outbox')
+        failing.refresh_from_db()
+        assert failing.attempts == 2, (
+            'Проверьте, что после MAX_ATTEMPTS попыток письмо больше не отправляется'
+        )
@@ -0,0 +1,103 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.fixture
+def rates(settings):
+    def set_rates(**rates):
+        settings.REST_FRAMEWORK = dict(
+            settings.REST_FRAMEWORK,
+            DEFAULT_THROTTLE_RATES=dict(settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'], **rates)
+        )
+    return set_rates
+
+
+class Test27Throttling:
+    url_signup = '/api/v1/auth/signup/'
+    url_token = '/api/v1/auth/token/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_identity_limit(self, client, rates):
+        rates(auth_ip='100/min', auth_identity='2/min')
+        data = {'username': 'bot', 'confirmation_code': '00000000'}
+        for _ in range(2):
+            assert client.post(self.url_token, data=data).status_code != 429
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(self.url_token, data=data)
+        assert response.status_code == 429, (
+            f'Проверьте, что `{self.url_token}` ограничивает число запросов для одного имени пользователя'
+        )
+        assert int(response['Retry-After']) >= 1, (
+            'Проверьте, что ответ 429 содержит заголовок Retry-After'
+        )
+        assert len(context) == 0, (
+            'Проверьте, что отклонённый запрос не обращается к базе данных'
+        )
+        assert client.post(self.url_token, data={**data, 'username': 'other'}).status_code != 429
+
+        client.post(self.url_signup, data={'username': 'first', 'email': 'Same@yamdb.fake'})
+        client.post(self.url_signup, data={'username': 'second', 'email': 'same@yamdb.fake'})
+        response = client.post(self.url_signup, data={'username': 'third', 'email': 'SAME@yamdb.fake '})
+        assert response.status_code == 429, (
+            f'Проверьте, что `{self.url_signup}` ограничивает число запросов для одного адреса почты'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_ip_limit(self, client, rates):
+        rates(auth_ip='3/min', auth_identity='100/min')
+        for number in range(3):
+            response = client.post(self.url_token, data={'username': f'user{number}'}, REMOTE_ADDR='10.0.0.1')
+            assert response.status_code != 429
+        response = client.post(self.url_token, data={'username': 'user9'}, REMOTE_ADDR='10.0.0.1')
+        assert response.status_code == 429, (
+            'Проверьте, что запросы к `/api/v1/auth/` ограничиваются для одного IP-адреса'
+        )
+        response = client.post(self.url_token, data={'username': 'user9'}, REMOTE_ADDR='10.0.0.2')
+        assert response.status_code != 429
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_spoofed_forwarded_for(self, client, rates):
+        rates(auth_ip='3/min', auth_identity='100/min')
+        statuses = [
+            client.post(
+                self.url_token, data={'username': f'user{number}'},
+                REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR=f'192.0.2.{number}'
+            ).status_code
+            for number in range(6)
+        ]
+        assert statuses.count(429) == 3, (
+            'Проверьте, что лимит по IP-адресу нельзя обойти подменой заголовка X-Forwarded-For'
+        )
+
+    def test_03_sliding_window(self, rates):
+        from rest_framework.request import Request
+        from rest_framework.test import APIRequestFactory
+
+        from api.throttling import AuthIPThrottle
+
+        rates(auth_ip='10/min')
+        now = [60 * 1000 + 15]
+        request = Request(APIRequestFactory().post('/api/v1/auth/token/'))
+
+        def allowed():
+            throttle = AuthIPThrottle()
+            throttle.timer = lambda: now[0]
+            return throttle.allow_request(request, None), throttle
+
+        for _ in range(10):
+            assert allowed()[0]
+        result, throttle = allowed()
+        assert not result and throttle.wait() == 45, (
+            'Проверьте, что при заполненном окне ждать нужно, пока запросы не выйдут из окна'
+        )
+        now[0] += 30
+        assert not allowed()[0], (
+            'Проверьте, что запросы предыдущего окна учитываются пропорционально'
+        )
+        now[0] += 30
+        for _ in range(3):
+            assert allowed()[0]
+        assert not allowed()[0], (
+            'Проверьте, что в новом окне доступна только часть лимита'
+        )